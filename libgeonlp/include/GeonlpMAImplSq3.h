@@ -72,7 +72,15 @@ namespace geonlp
 
     /// 利用するクラスのリスト、高速化のため記憶
     std::vector<std::string> activeClasses;
-    
+
+    /// activeClasses をコンパイルした正規表現のリスト
+    /// 地名語候補ごとに再コンパイルしないため記憶
+    /// first が true の要素は除外パターン
+    std::vector<std::pair<bool, boost::regex> > activeClassRegexes;
+
+    /// activeClasses から activeClassRegexes を再構築する
+    void compileActiveClasses(void);
+
     typedef MeCabAdapter::NodeList NodeList;
 		
     typedef std::list<NodeExt> NodeExtList;
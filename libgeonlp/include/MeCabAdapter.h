@@ -15,7 +15,9 @@
 #include "Exception.h"
 
 namespace MeCab{
+	class Model;
 	class Tagger;
+	class Lattice;
 }
 
 namespace geonlp
@@ -31,7 +33,7 @@ namespace geonlp
 		typedef std::list<Node> NodeList;
 		
 		/// @brief コンストラクタ。
-		MeCabAdapter(): mecabp(NULL) {};
+		MeCabAdapter(): modelp(NULL), mecabp(NULL) {};
 
 		// 初期化。
 		/// @arg @c userdic ユーザ辞書ファイル名
@@ -42,6 +44,9 @@ namespace geonlp
 		void terminate();
 	
 	private:
+		/// @brief MeCabのモデル。
+		MeCab::Model* modelp;
+
 		/// @brief MeCabのハンドラ。
 		MeCab::Tagger* mecabp;
 		
@@ -11,7 +11,7 @@
 #include <cassert>
 #include <string.h>
 #include <boost/regex.hpp>
-#include <boost/filesystem.hpp>
+#include <filesystem>
 #include "config.h"
 #include "darts.h"
 #include "DBAccessor.h"
@@ -110,6 +110,15 @@ namespace geonlp
       throw std::runtime_error(errmsg);
     }
 
+    // 読み込みをメモリマップ I/O で行なう（最大 256MB）。
+    // ユーザ空間バッファへのコピーを省き、複数プロセスの
+    // ワーカー間でページキャッシュを共有できる。
+    // mmap を利用できない環境では通常の読み込みになる。
+    sqlite3_exec(sqlitep, "PRAGMA mmap_size=268435456;",
+                 NULL, NULL, NULL);
+    sqlite3_exec(wordlistp, "PRAGMA mmap_size=268435456;",
+                 NULL, NULL, NULL);
+
     // テーブルがまだ存在しない場合は作成する
     if (create_tables_needed) {
       this->createTables();  // ここでロック
@@ -1031,10 +1040,10 @@ namespace geonlp
     this->clearGeowordCache();
 
     // 一時ファイルを正規ファイルに移動
-    boost::filesystem::path tmppath(tmp_darts_fname);
-    boost::filesystem::path regpath(this->darts_fname);
-    boost::filesystem::remove(regpath);
-    boost::filesystem::rename(tmppath, regpath);
+    std::filesystem::path tmppath(tmp_darts_fname);
+    std::filesystem::path regpath(this->darts_fname);
+    std::filesystem::remove(regpath);
+    std::filesystem::rename(tmppath, regpath);
   }
 
   /// @brief geowordテーブルから得られた情報が、期待する順序でカラムが並んでいることを確認する
@@ -1209,7 +1218,8 @@ namespace geonlp
     Geoword geoword;
 
     ret.clear();
-    boost::regex pattern = boost::regex("([^\\/:]+):([^\\/:]*)", boost::regex_constants::egrep);
+    // 定数パターンは一度だけコンパイルする
+    static const boost::regex pattern("([^\\/:]+):([^\\/:]*)", boost::regex_constants::egrep);
 
     for (boost::sregex_iterator it = boost::make_regex_iterator(idlist, pattern); it != boost::sregex_iterator(); it++) {
       std::string geonlp_id = (*it)[1]; // geonlp_id
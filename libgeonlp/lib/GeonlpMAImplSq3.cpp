@@ -260,6 +260,7 @@ namespace geonlp
   /// @brief 利用するクラス正規表現を指定する
   void MAImpl::setActiveClasses(const std::vector<std::string>& ne_classes) {
     this->activeClasses = ne_classes;
+    this->compileActiveClasses();
   }
 
   /// @brief 利用する固有名クラスの正規表現を追加する
@@ -275,6 +276,7 @@ namespace geonlp
       }
       if (!is_exist) this->activeClasses.push_back((*it));
     }
+    this->compileActiveClasses();
   }
 
   /// @brief 利用する固有名クラスの正規表現を除外する
@@ -288,11 +290,27 @@ namespace geonlp
         }
       }
     }
+    this->compileActiveClasses();
   }
 
   /// @brief 利用するクラス正規表現をリセットする（デフォルトに戻す）
   void MAImpl::resetActiveClasses() {
     this->activeClasses = this->defaultClasses;
+    this->compileActiveClasses();
+  }
+
+  /// @brief activeClasses をコンパイルして activeClassRegexes を更新する
+  /// クラスの指定が変わった時に一度だけコンパイルすることで、
+  /// 地名語候補ごとの再コンパイルを避ける
+  void MAImpl::compileActiveClasses() {
+    this->activeClassRegexes.clear();
+    for (std::vector<std::string>::const_iterator it = this->activeClasses.begin(); it != this->activeClasses.end(); it++) {
+      if ((*it).c_str()[0] == '-') { // 除外パターン指定
+        this->activeClassRegexes.push_back(std::make_pair(true, boost::regex((*it).substr(1), boost::regex_constants::egrep)));
+      } else {
+        this->activeClassRegexes.push_back(std::make_pair(false, boost::regex((*it), boost::regex_constants::egrep)));
+      }
+    }
   }
 
   /// @brief 利用しているクラス正規表現のリストを返す
@@ -908,20 +926,18 @@ namespace geonlp
     if (!is_in) return false;
 
     // クラスのチェック
+    // 正規表現は setActiveClasses() などでコンパイル済みのものを利用する
     is_in = false;
-    if (this->activeClasses.size() > 0) {
+    if (this->activeClassRegexes.size() > 0) {
       std::string ne_class = geo.get_ne_class();
-      boost::regex pattern;
-      for (std::vector<std::string>::const_iterator it = this->activeClasses.begin(); it != this->activeClasses.end(); it++) {
-        if ((*it).c_str()[0] == '-') { // 除外パターン指定
-          pattern = boost::regex((*it).substr(1), boost::regex_constants::egrep);
-          if (boost::regex_match(ne_class, pattern)) {
+      for (std::vector<std::pair<bool, boost::regex> >::const_iterator it = this->activeClassRegexes.begin(); it != this->activeClassRegexes.end(); it++) {
+        if ((*it).first) { // 除外パターン指定
+          if (boost::regex_match(ne_class, (*it).second)) {
             is_in = false; // 除外パターンに一致してもさらに調べる
             // return false; // 除外パターンに一致したら常に不一致とする
           }
         } else if (!is_in) { // まだ一致するパターンが見つかっていない場合は探す
-          pattern = boost::regex((*it), boost::regex_constants::egrep);
-          if (boost::regex_match(geo.get_ne_class(), pattern)) {
+          if (boost::regex_match(ne_class, (*it).second)) {
             is_in = true;
           }
         }
@@ -952,7 +968,8 @@ namespace geonlp
 
     std::string subclass3 = node.get_subclassification3();
 
-    boost::regex pattern = boost::regex("([^\\/:]+):([^\\/:]*)", boost::regex_constants::egrep);
+    // 定数パターンは一度だけコンパイルする
+    static const boost::regex pattern("([^\\/:]+):([^\\/:]*)", boost::regex_constants::egrep);
     for (boost::sregex_iterator it = boost::make_regex_iterator(subclass3, pattern); it != boost::sregex_iterator(); it++) {
       std::string geonlp_id = (*it)[1]; // geonlp_id
       // std::string typical_name = (*it)[2]; // typical name
@@ -7,6 +7,7 @@
 ///
 #include <iostream>
 #include <fstream>
+#include <memory>
 
 #include "MeCabAdapter.h"
 #include "Node.h"
@@ -38,16 +39,25 @@ namespace geonlp
       if (!initparam.empty()) initparam += " ";
       initparam += std::string("--dicdir=") + system_dic_dir;
     }
-    mecabp = MeCab::createTagger( initparam.c_str());
+    // Tagger を直接生成する代わりに Model を経由して生成する。
+    // Model から生成した Tagger と Lattice の組み合わせでは
+    // Tagger 内部のロックを使わずに並列に解析できる。
+    modelp = MeCab::createModel( initparam.c_str());
+    if ( modelp == NULL){
+      throw std::runtime_error( MeCab::getTaggerError());
+    }
+    mecabp = modelp->createTagger();
     if ( mecabp == NULL){
       throw std::runtime_error( MeCab::getTaggerError());
     }
   }
-	
+
   /// @brief 終了処理。
   void MeCabAdapter::terminate() {
     if (mecabp) delete mecabp;
     mecabp = NULL;
+    if (modelp) delete modelp;
+    modelp = NULL;
   }
 	
   /// @brief 引数として渡された自然文を形態素解析し、解析結果の各行を要素とするノードの配列を返す。
@@ -59,10 +69,20 @@ namespace geonlp
   MeCabAdapter::NodeList MeCabAdapter::parse(const std::string & sentence) {
 			
     if ( mecabp ==NULL) throw MeCabNotInitializedException();
-    const MeCab::Node *mecab_node = mecabp->parseToNode( sentence.c_str());
-    if (! mecab_node) {
-      throw MeCabErrException( mecabp->what());
+
+    // Lattice をスレッドごとに生成して再利用する。
+    // Tagger::parse(Lattice*) はスレッドセーフなので、
+    // 複数スレッドからの解析がロックで直列化されない。
+    thread_local std::unique_ptr<MeCab::Lattice> latticep;
+    if (! latticep) {
+      latticep.reset( MeCab::createLattice());
+    }
+    MeCab::Lattice* lattice = latticep.get();
+    lattice->set_sentence( sentence.c_str());
+    if (! mecabp->parse( lattice)) {
+      throw MeCabErrException( lattice->what());
     }
+    const MeCab::Node *mecab_node = lattice->bos_node();
 			
     MeCabAdapter::NodeList nodelist;
     for (;  mecab_node; mecab_node = mecab_node->next) {
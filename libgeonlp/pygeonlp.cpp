@@ -128,6 +128,71 @@ static PyObject * geonlp_ma_parse_node(GeonlpMA *self, PyObject *args)
   return NULL;
 }
 
+static PyObject * geonlp_ma_parse_node_list(GeonlpMA *self, PyObject *args)
+// Parse multiple sentences at once and return list of list of objects
+{
+  PyObject *pysentences;
+
+  if (!PyArg_ParseTuple(args, "O", &pysentences)) return NULL;
+  if (!PyList_Check(pysentences)) {
+    PyErr_SetString(PyExc_TypeError,
+                    "The parameter must be a list of strings.");
+    return NULL;
+  }
+
+  Py_ssize_t n_sentences = PyList_Size(pysentences);
+  std::vector<std::string> sentences(n_sentences);
+  for (Py_ssize_t i = 0; i < n_sentences; i++) {
+    PyObject *item = PyList_GetItem(pysentences, i);
+    if (!PyUnicode_Check(item)) {
+      PyErr_SetString(PyExc_TypeError,
+                      "The parameter must be a list of strings.");
+      return NULL;
+    }
+    const char *utf8 = PyUnicode_AsUTF8AndSize(item, NULL);
+    if (utf8 == NULL) {
+      // e.g. UnicodeEncodeError for strings containing lone surrogates
+      return NULL;
+    }
+    sentences[i] = utf8;
+  }
+
+  // Analyze all sentences in a single C++ loop with the GIL
+  // released, so that the per-call overhead is paid only once
+  // and other Python threads can run in the meantime.
+  std::vector<std::vector<geonlp::Node> > results(n_sentences);
+  std::string errmsg;
+  Py_BEGIN_ALLOW_THREADS
+  try {
+    for (Py_ssize_t i = 0; i < n_sentences; i++) {
+      (self->_ptrObj)->parseNode(sentences[i], results[i]);
+    }
+  } catch (std::exception & e) {
+    errmsg = e.what();
+  }
+  Py_END_ALLOW_THREADS
+  if (!errmsg.empty()) {
+    PyErr_SetString(PyExc_RuntimeError, errmsg.c_str());
+    return NULL;
+  }
+
+  PyObject *pylist = PyList_New(n_sentences);
+  for (Py_ssize_t i = 0; i < n_sentences; i++) {
+    Py_ssize_t n = (Py_ssize_t) results[i].size();
+    PyObject *pyinner = PyList_New(n);
+
+    for (Py_ssize_t j = 0; j < n; j++) {
+      picojson::object pico_obj = results[i][j].toObject();
+      picojson::value v(pico_obj);
+      PyList_SetItem(pyinner, j, picojson_to_pyobject(v));
+    }
+
+    PyList_SetItem(pylist, i, pyinner);
+  }
+
+  return pylist;
+}
+
 static PyObject * geonlp_ma_get_word_info(GeonlpMA *self, PyObject *args)
 // Get attributes of geo-words from their geonlp_id list.
 {
@@ -394,6 +459,7 @@ static PyObject * geonlp_ma_get_dictionary_identifier_by_id(GeonlpMA *self, PyOb
 static PyMethodDef GeonlpMAMethods[] = {
   {"parse", (PyCFunction)geonlp_ma_parse, METH_VARARGS, "Parse the sentence and return a formatted text."},
   {"parseNode", (PyCFunction)geonlp_ma_parse_node, METH_VARARGS, "Parse the sentece and return list of dict."},
+  {"parseNodeList", (PyCFunction)geonlp_ma_parse_node_list, METH_VARARGS, "Parse multiple sentences and return list of list of dict."},
   {"getWordInfo", (PyCFunction)geonlp_ma_get_word_info, METH_VARARGS, "Get word information."},
   {"searchWord", (PyCFunction)geonlp_ma_search_word, METH_VARARGS, "Search word by its spelling or reading."},
   {"getDictionaryList", (PyCFunction)geonlp_ma_list_dictionary, METH_NOARGS, "Get installed dictionary list."},
@@ -3,7 +3,6 @@ import os
 import warnings
 
 from deprecated import deprecated
-import jageocoder
 
 from pygeonlp.api.dict_manager import DictManager
 from pygeonlp.api.workflow import Workflow, WorkflowError
@@ -69,6 +68,7 @@ def get_jageocoder_db_dir():
                    'jageocoder.get_db_dir() を利用してください。'),
                   DeprecationWarning)
 
+    import jageocoder
     return jageocoder.get_db_dir()
 
 
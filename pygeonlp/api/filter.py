@@ -6,6 +6,11 @@ from pygeonlp.api.node import Node
 
 logger = logging.getLogger(__name__)
 
+# 固有名クラスから基本クラス（'/' より前の部分）への変換キャッシュ。
+# クラス文字列は辞書に由来する少数の値が繰り返し出現するため、
+# プロセス内で共有する。基本クラスを持たない場合は空文字列。
+_ne_basic_classes = {}
+
 
 class FilterError(RuntimeError):
     """
@@ -97,6 +102,10 @@ class Filter(object):
                 })
                 new_node.geometry = None
                 new_node.prop = None
+                new_node._ne_class = None
+                # 元の地名語ノードが _attr にキャッシュした座標などを
+                # 引き継がないようにリセットする
+                new_node._attr = {}
                 output[i] = [new_node]
                 continue
 
@@ -138,8 +147,17 @@ class Filter(object):
         passed = []
         excluded = []
 
-        for candidate in candidates:
-            if self.filter_func(candidate):
+        filter_batch = getattr(self, 'filter_batch', None)
+        if filter_batch is not None and len(candidates) > 1 \
+                and self._can_filter_batch():
+            # 候補ノードをまとめて判定できるフィルタの場合は
+            # ベクトル化された判定処理を利用する
+            results = filter_batch(candidates)
+        else:
+            results = [self.filter_func(c) for c in candidates]
+
+        for candidate, result in zip(candidates, results):
+            if result:
                 if candidate.prop is None:
                     # 地名語・住所以外の形態素
                     passed.append(candidate)
@@ -159,6 +177,31 @@ class Filter(object):
 
         return passed
 
+    def _can_filter_batch(self):
+        """
+        ``filter_batch()`` による一括判定が利用できるかどうかを
+        返します。
+
+        ``filter_func()`` だけを上書きした派生クラスでは、
+        基底クラスの ``batch_func()`` が上書き前の判定を
+        行なってしまうため、``filter_func()`` を定義したクラスと
+        同じか、それより派生したクラスで ``batch_func()`` が
+        定義されている場合のみ一括判定を利用します。
+
+        Returns
+        -------
+        bool
+            一括判定を利用できる場合 True。
+        """
+        for klass in type(self).__mro__:
+            if 'batch_func' in vars(klass):
+                return True
+
+            if 'filter_func' in vars(klass):
+                return False
+
+        return False
+
     def filter_func(candidate):
         """
         候補ノードが条件に一致するかどうかを判定します。
@@ -219,26 +262,33 @@ class Filter(object):
         {'num_geowords': 1, 'num_addresses': 0,
             'ne_classes': {'鉄道施設/鉄道駅': 1, '鉄道施設': 1}}
         """
+        # 全ノードに対して実行するループなので、
+        # 名前解決を減らすために定数やメソッドをローカル変数に束縛する
+        NORMAL = Node.NORMAL
+        ADDRESS = Node.ADDRESS
+        GEOWORD = Node.GEOWORD
         num_geowords = 0
         num_addresses = 0
         ne_classes = {}
+        ne_classes_get = ne_classes.get
         for nodes in lattice:
             contains_geoword = False
             contains_address = False
-            ne_list = []
+            seen = {}
             for node in nodes:
-                if node.node_type == Node.NORMAL:
+                node_type = node.node_type
+                if node_type == NORMAL:
                     continue
 
-                if node.node_type == Node.ADDRESS:
+                if node_type == ADDRESS:
                     contains_address = True
                     continue
 
-                if node.node_type == Node.GEOWORD:
+                if node_type == GEOWORD:
                     contains_geoword = True
-                    ne_class = node.prop.get('ne_class', None)
-                    if ne_class:
-                        ne_list.append(ne_class)
+                    ne_class = node._ne_class
+                    if ne_class and ne_class not in seen:
+                        seen[ne_class] = True
 
             if contains_geoword:
                 num_geowords += 1
@@ -246,20 +296,19 @@ class Filter(object):
             if contains_address:
                 num_addresses += 1
 
-            for ne in set(ne_list):
-                if ne in ne_classes:
-                    ne_classes[ne] += 1
-                else:
-                    ne_classes[ne] = 1
+            for ne in seen:
+                ne_classes[ne] = ne_classes_get(ne, 0) + 1
 
-                if '/' not in ne:
+                ne_basic = _ne_basic_classes.get(ne)
+                if ne_basic is None:
+                    head, sep, _ = ne.partition('/')
+                    ne_basic = head if sep else ''
+                    _ne_basic_classes[ne] = ne_basic
+
+                if not ne_basic:
                     continue
 
-                ne_basic = ne[0: ne.find('/')]
-                if ne_basic in ne_classes:
-                    ne_classes[ne_basic] += 1
-                else:
-                    ne_classes[ne_basic] = 1
+                ne_classes[ne_basic] = ne_classes_get(ne_basic, 0) + 1
 
         return {
             "num_geowords": num_geowords,
@@ -289,6 +338,9 @@ class EntityClassFilter(Filter):
         super().__init__(**kwargs)
         self.when_all_failed = 'convert_to_normal'
         self.re_ne_class = re.compile(ne_class)
+        # 固有名クラスは辞書に由来する少数の文字列が繰り返し出現するので
+        # クラス文字列ごとの照合結果を記憶する
+        self._match_results = {}
 
     def filter_func(self, candidate, **kwargs):
         """
@@ -303,18 +355,19 @@ class EntityClassFilter(Filter):
             ne_class に一致する場合は True,
             一致しない場合は Falase
         """
-        prop = candidate.prop
-        if prop is None:
+        ne_class = candidate._ne_class
+        if ne_class is None:
             # 非地名語ノードも削除する
             # 条件に該当する地名語ノードが無い場合は、
             # when_all_failed の指定により全てのノードが復元される
             return False
 
-        ne_class = prop.get('ne_class', None)
-        if ne_class is None:
-            return False
+        result = self._match_results.get(ne_class)
+        if result is None:
+            result = self.re_ne_class.match(ne_class) is not None
+            self._match_results[ne_class] = result
 
-        return self.re_ne_class.match(ne_class)
+        return result
 
 
 class GreedySearchFilter(Filter):
@@ -383,9 +436,11 @@ class GreedySearchFilter(Filter):
 
             n += 1
 
-        for k, geowords in enumerate(geowords_pile):
-            candidates = ",".join([x.simple() for x in geowords[1]])
-            logger.debug("{}: {}".format(k, candidates))
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        if debug_enabled:
+            for k, geowords in enumerate(geowords_pile):
+                candidates = ",".join([x.simple() for x in geowords[1]])
+                logger.debug("%d: %s", k, candidates)
 
         # ラティスの i 番目のノード集合を最適なものに絞り込む
         pile_index = 0
@@ -406,26 +461,32 @@ class GreedySearchFilter(Filter):
             best_nodes = input[i]
             while dt < len(geowords_pile):
                 # pile_index - dt 番目の地名語集合を手がかりとする
-                candidates = ",".join([x.simple() for x in input[i]])
-
                 k = pile_index - dt
                 if k >= 0:
                     hint_geowords = geowords_pile[k][1]
-                    hints = ",".join([x.simple() for x in hint_geowords])
                     best_nodes = self._get_best(input[i], hint_geowords)
                     if len(best_nodes) == 1:
-                        logger.debug("'{}' を選択（候補:{}, ヒント:{}）".format(
-                            best_nodes[0].simple(), candidates, hints))
+                        if debug_enabled:
+                            logger.debug(
+                                "'%s' を選択（候補:%s, ヒント:%s）",
+                                best_nodes[0].simple(),
+                                ",".join([x.simple() for x in input[i]]),
+                                ",".join(
+                                    [x.simple() for x in hint_geowords]))
                         break
 
                 k = pile_index + dt
                 if k < len(geowords_pile):
                     hint_geowords = geowords_pile[k][1]
-                    hints = ",".join([x.simple() for x in hint_geowords])
                     best_nodes = self._get_best(input[i], hint_geowords)
                     if len(best_nodes) == 1:
-                        logger.debug("'{}' を選択（候補:{}, ヒント:{}）".format(
-                            best_nodes[0].simple(), candidates, hints))
+                        if debug_enabled:
+                            logger.debug(
+                                "'%s' を選択（候補:%s, ヒント:%s）",
+                                best_nodes[0].simple(),
+                                ",".join([x.simple() for x in input[i]]),
+                                ",".join(
+                                    [x.simple() for x in hint_geowords]))
                         break
 
                 dt += 1
@@ -480,12 +541,26 @@ class InputBasedFilter(Filter):
     変更して、実時間で処理可能な候補に絞り込むフィルタ。
     """
 
+    # 地名語の出現密度によるフィルタ選択を行なうかどうか。
+    # 密度判定を利用しないサブクラスは False を設定すると
+    # count_geowords() による集計をスキップできます。
+    _needs_stats = True
+
     def __init__(self, **kwargs):
         """
         フィルタを初期化します。
         このクラスには指定するパラメータはありません。
         """
         super().__init__(**kwargs)
+        # 入力に応じて適用するフィルタの組はあらかじめ決まっているので、
+        # apply() のたびに作り直さずに初期化時に一度だけ作成しておく
+        greedy_filter = GreedySearchFilter()
+        self._pref_filters = (
+            EntityClassFilter(r'都道府県/?.*'), greedy_filter,)
+        self._city_filters = (
+            EntityClassFilter(r'(都道府県|市区町村)/?.*'), greedy_filter,)
+        self._station_filters = (
+            EntityClassFilter(r'(市区町村|鉄道施設)/?.*'), greedy_filter,)
 
     def apply(self, lattice, **kwargs):
         """
@@ -507,32 +582,29 @@ class InputBasedFilter(Filter):
         高い密度で出現する文字列を解析する場合、候補となるクラスを
         絞り込んで解析処理時間を短縮し、精度を向上させます。
         """
-        filters = []
+        if not self._needs_stats:
+            return lattice
+
+        filters = ()
 
-        search_plan = "exhaustive"
         gstat = Filter.count_geowords(lattice)
         ne_classes = gstat['ne_classes']
         num_geowords = gstat['num_geowords']
 
+        # 地震速報や時刻表など同種の地名語が多数出現する場合は
+        # クラスを絞り込んだ後に GreedySearchFilter を適用する
         if num_geowords >= 5 and \
            ne_classes.get('都道府県', 0) / num_geowords >= 0.75:
             # 都道府県リスト
-            filters.append(EntityClassFilter(r'都道府県/?.*'))
-            search_plan = "greedy"
+            filters = self._pref_filters
         elif num_geowords >= 5 and \
                 ne_classes.get('市区町村', 0) / num_geowords >= 0.75:
             # 市区町村リスト
-            filters.append(EntityClassFilter(r'(都道府県|市区町村)/?.*'))
-            search_plan = "greedy"
+            filters = self._city_filters
         elif num_geowords >= 5 and \
                 ne_classes.get('鉄道施設', 0) / num_geowords >= 0.75:
             # 鉄道駅リスト（交通情報や時刻表など）
-            filters.append(EntityClassFilter(r'(市区町村|鉄道施設)/?.*'))
-            search_plan = "greedy"
-
-        if search_plan == "greedy":
-            # 地震速報や時刻表など同種の地名語が多数出現する場合
-            filters.append(GreedySearchFilter())
+            filters = self._station_filters
 
         # 選択したフィルタを適用
         for f in filters:
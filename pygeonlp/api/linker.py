@@ -1,4 +1,4 @@
-from logging import getLogger
+from logging import DEBUG, getLogger
 import os
 
 from pygeonlp.api.node import Node
@@ -117,7 +117,7 @@ class LinkedResults(object):
 
             n += 1
 
-        logger.debug("ノード種別リスト: {}".format(self.node_types))
+        logger.debug("ノード種別リスト: %s", self.node_types)
 
     def increment_counter(self):
         """
@@ -259,6 +259,35 @@ class Evaluator(object):
 
         return n
 
+    def prepare(self, lattice):
+        """
+        ラティス全体に対する前処理を行ないます。
+
+        ラティスを分割して ``get()`` を繰り返し呼びだす前に、
+        一度だけ呼びだしてください。
+        デフォルト実装では、スコアリングの際にノードの組み合わせごとに
+        繰り返し参照される地名語ノードの hypernym 集合と表記集合を
+        事前に計算します。
+
+        スコアリングクラスがラティス全体の統計情報を必要とする場合は、
+        このメソッドをオーバーライドして計算してください。
+
+        Parameters
+        ----------
+        lattice : list
+            入力となるラティス表現。
+        """
+        for nodes in lattice:
+            for node in nodes:
+                if node.node_type != Node.GEOWORD:
+                    continue
+
+                if 'hypernym_set' not in node._attr:
+                    node._attr['hypernym_set'] = set(
+                        node.prop.get('hypernym', []))
+
+                node.get_notations()
+
     def get(self, lattice):
         """
         ラティス表現を入力として、スコアリングと並べ替えを行ないます。
@@ -289,9 +318,10 @@ class Evaluator(object):
                 "score": score,
                 "result": path,
             }
-            simple_repr = ''.join([x.simple() for x in path])
-            logger.debug("{} => {}".format(simple_repr, score))
-            logger.debug("next:{}".format(lr.counter()))
+            if logger.isEnabledFor(DEBUG):
+                simple_repr = ''.join([x.simple() for x in path])
+                logger.debug("%s => %s", simple_repr, score)
+                logger.debug("next:%s", lr.counter())
 
             # スコアが高いものから順に最大 max_results 個の結果を保持する
             n = len(results)
@@ -370,18 +400,24 @@ class Evaluator(object):
         return results
 
     @staticmethod
-    def collect_geowords(result):
+    def iter_geowords(result):
         """
-        パス表現の結果に含まれる地名語のセットを返します。
+        パス表現の結果に含まれる地名語を順に返すジェネレータです。
 
-        処理結果に含まれる地名語だけを列挙する場合に利用する簡易メソッドです。
+        リストを作成しないため、途中で列挙を打ち切る場合に利用します。
         """
-        geowords = []
         for node in result:
             if node.node_type == Node.GEOWORD:
-                geowords.append(node)
+                yield node
 
-        return geowords
+    @staticmethod
+    def collect_geowords(result):
+        """
+        パス表現の結果に含まれる地名語のセットを返します。
+
+        処理結果に含まれる地名語だけを列挙する場合に利用する簡易メソッドです。
+        """
+        return list(Evaluator.iter_geowords(result))
 
     @staticmethod
     def collect_addresses(result):
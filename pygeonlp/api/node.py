@@ -40,6 +40,20 @@ class Node(object):
     GEOWORD = 1
     ADDRESS = 2
 
+    # node_type の値から表記文字列への変換テーブル
+    __TYPE_STRINGS = {
+        NORMAL: "NORMAL",
+        GEOWORD: "GEOWORD",
+        ADDRESS: "ADDRESS",
+    }
+
+    # ノードはラティス表現の中に大量に作成されるため、
+    # インスタンス辞書を持たないようにしてメモリ使用量と
+    # 属性アクセスのコストを減らす
+    __slots__ = ('surface', 'node_type', 'morphemes',
+                 'geometry', 'prop', '_attr', '_pos', '_sub1',
+                 '_ne_class',)
+
     def __init__(self, surface, node_type, morphemes,
                  geometry=None, prop=None):
         """
@@ -54,6 +68,16 @@ class Node(object):
         self.geometry = geometry
         self.prop = prop
         self._attr = {}  # 動的に計算する属性
+        # 頻繁に参照される形態素属性は属性アクセスで読めるようにしておく
+        if isinstance(morphemes, dict):
+            self._pos = morphemes.get('pos')
+            self._sub1 = morphemes.get('subclass1')
+        else:
+            self._pos = None
+            self._sub1 = None
+
+        # 固有名クラスも辞書引きせずに読めるようにしておく
+        self._ne_class = prop.get('ne_class') if prop else None
 
     def get_lonlat(self):
         """
@@ -98,14 +122,7 @@ class Node(object):
         return None
 
     def __get_type_string(self):
-        if self.node_type == self.__class__.NORMAL:
-            return "NORMAL"
-        elif self.node_type == self.__class__.GEOWORD:
-            return "GEOWORD"
-        elif self.node_type == self.__class__.ADDRESS:
-            return "ADDRESS"
-
-        return "UNKNOWN"
+        return self.__TYPE_STRINGS.get(self.node_type, "UNKNOWN")
 
     def __repr__(self):
         return json.dumps(self.as_dict(), ensure_ascii=False)
@@ -203,22 +220,21 @@ class Node(object):
         else:
             morphemes = self.morphemes
 
-        feature = {
-            "type": "Feature",
-            "geometry": self.geometry,
-            "properties": {
-                "surface": self.surface,
-                "node_type": self.__get_type_string(),
-                "morphemes": morphemes,
-            }
+        properties = {
+            "surface": self.surface,
+            "node_type": self.__get_type_string(),
+            "morphemes": morphemes,
         }
-
         if self.node_type == Node.GEOWORD:
-            feature['properties']['geoword_properties'] = self.prop
+            properties['geoword_properties'] = self.prop
         elif self.node_type == Node.ADDRESS:
-            feature['properties']['address_properties'] = self.prop
+            properties['address_properties'] = self.prop
 
-        return feature
+        return {
+            "type": "Feature",
+            "geometry": self.geometry,
+            "properties": properties,
+        }
 
     def _add_node(self, surface, node):
         """
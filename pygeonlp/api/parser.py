@@ -1,10 +1,8 @@
 import copy
+from functools import lru_cache
 import logging
 import re
 
-import jageocoder as _jageocoder
-from jageocoder.itaiji import converter as itaiji_converter
-
 from pygeonlp.api.node import Node
 from pygeonlp.api.service import Service
 
@@ -60,6 +58,10 @@ class Parser(object):
             self.jageocoder_tree = None
 
         else:
+            # jageocoder は import と辞書の読み込みに時間がかかるため、
+            # 利用する場合のみ読み込む
+            import jageocoder as _jageocoder
+
             # jageocoder 辞書が初期化されていなければ初期化
             if not _jageocoder.is_initialized():
                 try:
@@ -82,6 +84,16 @@ class Parser(object):
         else:
             self.address_regex = re.compile(address_regex)
 
+        # 同じ住所文字列を繰り返しジオコーディングする場合に備えて
+        # 問い合わせ結果をインスタンスごとにキャッシュする
+        self._search_node_cached = lru_cache(maxsize=1024)(
+            self._search_node)
+
+        # 同じ文を繰り返し解析する場合に備えて
+        # 形態素解析とラティス構築の結果もキャッシュする
+        self._analyze_sentence_cached = lru_cache(maxsize=1024)(
+            self._analyze_sentence)
+
     def set_jageocoder(self, jageocoder):
         """
         この Parser が利用する jageocoder を変更します。
@@ -93,8 +105,12 @@ class Parser(object):
             jageocoder モジュールのデフォルトオブジェクトを利用します。
             False を指定した場合、ジオコーディング機能を利用しません。
         """
+        import jageocoder as _jageocoder
         from jageocoder.tree import AddressTree
 
+        # ジオコーダーを変更するとキャッシュ済みの結果は無効になる
+        self._search_node_cached.cache_clear()
+
         if jageocoder is False:
             self.jageocoder_tree = None
             return
@@ -114,6 +130,17 @@ class Parser(object):
 
         self.jageocoder_tree = _jageocoder.get_module_tree()
 
+    def _search_node(self, address_string):
+        """
+        jageocoder で住所文字列をジオコーディングします。
+
+        結果は ``self._search_node_cached`` 経由で呼びだすと
+        LRU キャッシュされるため、ログや帳票のように同じ住所表記が
+        繰り返し出現するテキストではジオコーダーへの問い合わせを
+        省略できます。
+        """
+        return self.jageocoder_tree.searchNode(address_string)
+
     def check_word(self, word, filter):
         """
         Word の形態素情報が filter に含まれる全ての key, value と
@@ -180,7 +207,33 @@ class Parser(object):
         ['ます(NORMAL)']
         ['。(NORMAL)']
         """
+        # 利用中の辞書・固有名クラスが変わると同じ文でも
+        # 解析結果が変わるため、フィンガープリントをキャッシュの
+        # キーに含める
+        dict_fp = tuple(sorted(
+            x.get_identifier()
+            for x in self.service.getActiveDictionaries()))
+        class_fp = tuple(self.service.getActiveClasses())
+        lattice = self._analyze_sentence_cached(
+            sentence, dict_fp, class_fp)
+
+        # キャッシュした結果が呼び出し側の操作で書き換えられないよう、
+        # ノードごと深いコピーを返す。リストのコピーだけでは
+        # Node インスタンスが共有されるため、フィルタの
+        # convert_to_normal 処理などによる morphemes の更新が
+        # キャッシュ内のラティスに反映されてしまう
+        return copy.deepcopy(lattice)
+
+    def _analyze_sentence(self, sentence, dict_fp=(), class_fp=()):
+        """
+        sentence の形態素解析とラティス構築を行ないます。
 
+        結果は ``self._analyze_sentence_cached`` 経由で呼びだすと
+        LRU キャッシュされるため、同じ文を繰り返し解析する場合は
+        形態素解析を省略できます。
+        dict_fp, class_fp は利用中の辞書と固有名クラスを表す
+        フィンガープリントで、キャッシュのキーとしてのみ利用します。
+        """
         lattice = []
         words = self.service.ma_parseNode(sentence)
 
@@ -405,6 +458,9 @@ class Parser(object):
         if not self.jageocoder_tree:
             return lattice
 
+        import jageocoder as _jageocoder
+        from jageocoder.itaiji import converter as itaiji_converter
+
         i = 0  # 処理中のノードインデックス
         while i < len(lattice):
             nodes = lattice[i]
@@ -456,15 +512,14 @@ class Parser(object):
 
                     else:
                         # リモートサーバで住所として解析する
-                        results = self.jageocoder_tree.searchNode(node.surface)
+                        results = self._search_node_cached(node.surface)
                         if len(results) > 0 and results[0].matched == node.surface:
                             can_be_address = True
                             break
 
                         if node.morphemes['original_form'] != '':
                             alternative = node.morphemes['original_form']
-                            results = self.jageocoder_tree.searchNode(
-                                alternative)
+                            results = self._search_node_cached(alternative)
                             if len(results) > 0 and results[0].matched == alternative:
                                 can_be_address = True
                                 break
@@ -592,7 +647,7 @@ class Parser(object):
             cand = None
 
             for node in nodes:
-                if not self.address_regex.match(node.prop.get('ne_class', '')):
+                if not self.address_regex.match(node._ne_class or ''):
                     # 固有名クラスが住所表記のものではない
                     score = 0
                 else:
@@ -722,26 +777,35 @@ class Parser(object):
             pos: int
                 住所とみなされた形態素ノードの次のインデックス。
         """
-        surfaces = self.get_surfaces(lattice, pos, 50)
-        geocoding_result = self.jageocoder_tree.searchNode(''.join(surfaces))
-        if len(geocoding_result) == 0:
-            return {"address": None, "pos": pos}
-
-        address_string = geocoding_result[0][1]  # 変換できた住所文字列
-        check_address = re.sub(r'番$', '番地', address_string)
+        # やり直しは再帰呼び出しではなくループで行なう
+        # （形態素数に比例して再帰が深くなり RecursionError になるため）
+        while True:
+            surfaces = self.get_surfaces(lattice, pos, 50)
+            geocoding_result = self._search_node_cached(''.join(surfaces))
+            if len(geocoding_result) == 0:
+                return {"address": None, "pos": pos}
+
+            address_string = geocoding_result[0][1]  # 変換できた住所文字列
+            check_address = re.sub(r'番$', '番地', address_string)
+
+            # 一致した文字列が形態素ノード列のどの部分に当たるかチェック
+            surface = ''
+            i = 0
+            retry = False
+            while i < len(surfaces):
+                surface += surfaces[i]
+                if len(surface) > len(check_address):
+                    # 形態素 lattice[i] は住所の区切りと一致しないので
+                    # lattice[0:i] までを利用してジオコーディングをやり直す
+                    lattice = lattice[0:pos + i]
+                    retry = True
+                    break
 
-        # 一致した文字列が形態素ノード列のどの部分に当たるかチェック
-        surface = ''
-        i = 0
-        while i < len(surfaces):
-            surface += surfaces[i]
-            if len(surface) > len(check_address):
-                # 形態素 lattice[i] は住所の区切りと一致しないので
-                # lattice[0:i] までを利用してジオコーディングをやり直す
-                return self.get_addresses(lattice[0:pos + i], pos)
+                i += 1
+                if len(surface) == len(check_address):
+                    break
 
-            i += 1
-            if len(surface) == len(check_address):
+            if not retry:
                 break
 
         if i == 1 and lattice[pos][0].node_type == Node.GEOWORD:
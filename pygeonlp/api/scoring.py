@@ -100,7 +100,7 @@ class ScoringClass(object):
         # 同じ固有名クラスが複数含まれていると得点
         ne_classes = {}
         for geoword in geowords:
-            ne_class = geoword.prop['ne_class']
+            ne_class = geoword._ne_class
             if ne_class in ne_classes:
                 ne_classes[ne_class] += 1
             else:
@@ -169,19 +169,29 @@ class ScoringClass(object):
 
         if node0.node_type == Node.GEOWORD and node1.node_type == Node.GEOWORD:
             # 固有名クラスの一致度
-            if node0.prop['ne_class'] == node1.prop['ne_class']:
+            if node0._ne_class == node1._ne_class:
                 score += 10
 
         # 上位下位関係
+        # hypernym 集合は同じノードに対して何度も参照されるので
+        # _attr にキャッシュする（Evaluator.prepare() で事前計算される）
         hypernym_node0 = None
         hypernym_node1 = None
         if node0.node_type == Node.GEOWORD:
-            hypernym_node0 = set(node0.prop.get('hypernym', []))
+            hypernym_node0 = node0._attr.get('hypernym_set')
+            if hypernym_node0 is None:
+                hypernym_node0 = set(node0.prop.get('hypernym', []))
+                node0._attr['hypernym_set'] = hypernym_node0
+
             if hypernym_node0 & node1.get_notations():
                 score += 5
 
         if node1.node_type == Node.GEOWORD:
-            hypernym_node1 = set(node1.prop.get('hypernym', []))
+            hypernym_node1 = node1._attr.get('hypernym_set')
+            if hypernym_node1 is None:
+                hypernym_node1 = set(node1.prop.get('hypernym', []))
+                node1._attr['hypernym_set'] = hypernym_node1
+
             if hypernym_node1 & node0.get_notations():
                 score += 5
 
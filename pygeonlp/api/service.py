@@ -221,6 +221,28 @@ class Service(object):
         self._check_initialized()
         return self.capi_ma.parseNode(sentence)
 
+    def ma_parseNodeList(self, sentences):
+        """
+        複数のセンテンスをまとめて形態素解析し、センテンスごとの
+        解析結果のリストを返します。
+
+        C++ 側で全センテンスを一括して解析するため、
+        ``ma_parseNode()`` を繰り返し呼び出すよりも
+        呼び出しごとのオーバーヘッドが少なくなります。
+
+        Parameters
+        ----------
+        sentences : list of str
+            解析する文字列のリスト。
+
+        Returns
+        -------
+        list
+            ``ma_parseNode()`` の結果を要素とするリスト。
+        """
+        self._check_initialized()
+        return self.capi_ma.parseNodeList(list(sentences))
+
     def getWordInfo(self, geolod_id):
         """
         指定した geolod_id を持つ語の情報を返します。
@@ -344,6 +366,9 @@ class Service(object):
         if pattern is not None and not isinstance(pattern, str):
             raise TypeError("pattern は正規表現文字列で指定してください。")
 
+        # 辞書ごとに再コンパイルしないよう先にコンパイルしておく
+        pattern_re = re.compile(pattern) if pattern is not None else None
+
         dictionaries = self.capi_ma.getDictionaryList()
         active_dictionaries = []
         for dic_id, dictionary in dictionaries.items():
@@ -356,7 +381,7 @@ class Service(object):
                 active_dictionaries.append(int(dic_id))
                 continue
 
-            if pattern is not None and re.search(pattern, identifier):
+            if pattern_re is not None and pattern_re.search(identifier):
                 logger.debug("identifier が pattern に一致")
                 active_dictionaries.append(int(dic_id))
                 continue
@@ -409,6 +434,9 @@ class Service(object):
         if pattern is not None and not isinstance(pattern, str):
             raise TypeError("pattern は正規表現文字列で指定してください。")
 
+        # 辞書ごとに再コンパイルしないよう先にコンパイルしておく
+        pattern_re = re.compile(pattern) if pattern is not None else None
+
         current_active_dictionaries = self.capi_ma.getActiveDictionaries()
         new_active_dictionaries = []
         disactivated_dictionaries = []
@@ -422,7 +450,7 @@ class Service(object):
                 disactivated_dictionaries.append(identifier)
                 continue
 
-            if pattern is not None and re.search(pattern, identifier):
+            if pattern_re is not None and pattern_re.search(identifier):
                 logger.debug("identifier が pattern に一致")
                 disactivated_dictionaries.append(identifier)
                 continue
@@ -479,6 +507,9 @@ class Service(object):
         if pattern is not None and not isinstance(pattern, str):
             raise TypeError("pattern は正規表現文字列で指定してください。")
 
+        # 辞書ごとに再コンパイルしないよう先にコンパイルしておく
+        pattern_re = re.compile(pattern) if pattern is not None else None
+
         dictionaries = self.capi_ma.getDictionaryList()
         activated_dictionaries = []
         active_dictionaries = [
@@ -499,7 +530,7 @@ class Service(object):
                 activated_dictionaries.append(identifier)
                 continue
 
-            if pattern is not None and re.search(pattern, identifier) and \
+            if pattern_re is not None and pattern_re.search(identifier) and \
                     int(dic_id) not in active_dictionaries:
                 logger.debug("identifier が pattern に一致")
                 active_dictionaries.append(int(dic_id))
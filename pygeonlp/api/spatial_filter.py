@@ -10,8 +10,11 @@ GDAL Python パッケージをインストールするには、利用してい
 GDAL パッケージをインストールしない場合は空間フィルタは利用できません。
 """
 
+from functools import lru_cache
+import hashlib
 import json
 from logging import getLogger
+import os
 import urllib
 
 from pygeonlp.api.filter import Filter, FilterError
@@ -25,6 +28,283 @@ except ModuleNotFoundError:
 
 logger = getLogger(__name__)
 
+try:
+    import numpy as np
+    have_numpy = True
+except ModuleNotFoundError:
+    logger.info(("numpy パッケージがインストールされていないため、"
+                 "空間フィルタの一括判定処理をスキップします。"))
+    have_numpy = False
+
+try:
+    import shapely
+    import shapely.wkb
+    # contains_xy / intersects_xy による高速判定には Shapely 2 が必要
+    have_shapely = hasattr(shapely, 'contains_xy')
+except ModuleNotFoundError:
+    logger.info(("shapely パッケージがインストールされていないため、"
+                 "空間フィルタの判定に osgeo.ogr を利用します。"))
+    have_shapely = False
+
+
+def _disk_cache_path(url):
+    """
+    URL からダウンロードした GeoJSON を保存する
+    キャッシュファイルのパスを返す。
+
+    共有の一時ディレクトリでは他のユーザーが同名のファイルを
+    先に作成して内容を差し替えられるため、ユーザーごとの
+    キャッシュディレクトリに保存する。
+    """
+    digest = hashlib.blake2b(
+        url.encode('utf-8'), digest_size=16).hexdigest()
+    return os.path.join(
+        os.path.expanduser('~'), '.cache', 'pygeonlp',
+        'geojson_' + digest + '.geojson')
+
+
+@lru_cache(maxsize=32)
+def _download_geojson(url):
+    """
+    指定された URL から GeoJSON を含むファイルをダウンロードして
+    文字列として返す。
+    プロセスをまたいで同じファイルをダウンロードしないように、
+    取得した結果はキャッシュディレクトリにも保存する
+    （テストの実行のたびに同じ URL を取得し直すことを避ける）。
+    """
+    cache_path = _disk_cache_path(url)
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            return f.read()
+    except OSError:
+        pass
+
+    req = urllib.request.Request(url)
+    with urllib.request.urlopen(req) as res:
+        geojson = res.read().decode('utf-8')
+
+    # 別プロセスが読みかけのファイルを見ないように
+    # 一時ファイルに書き出してから rename する
+    tmp_path = '{}.{}'.format(cache_path, os.getpid())
+    try:
+        os.makedirs(os.path.dirname(cache_path), 0o755, exist_ok=True)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(geojson)
+
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass   # 保存できなくてもダウンロード結果は利用できる
+
+    return geojson
+
+
+# 解析済みジオメトリの WKB キャッシュ。
+# 同じ GeoJSON からフィルタを作り直す際の再解析を省略する
+_geom_cache = {}
+
+# prepare 済み Shapely ジオメトリのキャッシュ。
+# 同じ領域に対する GeoContainsFilter と GeoDisjointFilter を
+# 併用する場合などに、空間インデックスの構築を1回にまとめる
+_prep_cache = {}
+
+
+def _prepared_from_wkb(wkb):
+    """
+    WKB から prepare 済みの Shapely ジオメトリを作成する。
+    作成した結果は WKB をキーとしてキャッシュする。
+    """
+    geo = _prep_cache.get(wkb)
+    if geo is None:
+        geo = shapely.wkb.loads(wkb)
+        shapely.prepare(geo)
+        _prep_cache[wkb] = geo
+
+    return geo
+
+
+def _get_geometry_from_geojson_url(url):
+    """
+    URL から GeoJSON を含むファイルをダウンロードして、
+    osgeo.ogr.Geometry オブジェクトを作成する。
+    """
+    geo = None
+
+    try:
+        geojson = _download_geojson(url)
+        geo = _get_geometry_from_geojson(geojson)
+
+    except RuntimeError as e:
+        raise FilterError(str(e))
+
+    return geo
+
+
+def _polygon_to_ogr(rings):
+    """
+    GeoJSON の Polygon 座標リストから
+    Polygon タイプの osgeo.ogr.Geometry オブジェクトを組み立てる。
+    """
+    geo = ogr.Geometry(ogr.wkbPolygon)
+    for ring in rings:
+        linearring = ogr.Geometry(ogr.wkbLinearRing)
+        for xy in ring:
+            linearring.AddPoint_2D(xy[0], xy[1])
+
+        geo.AddGeometry(linearring)
+
+    return geo
+
+
+def _dict_to_ogr(geodict):
+    """
+    GeoJSON ジオメトリの dict から直接 osgeo.ogr.Geometry オブジェクトを
+    組み立てる。 JSON 文字列へのエンコードと OGR 側での再解析を省略できる。
+    対応していないタイプの場合は None を返す。
+    """
+    gtype = geodict.get('type')
+    coords = geodict.get('coordinates')
+    if coords is None:
+        return None
+
+    if gtype == 'Point':
+        geo = ogr.Geometry(ogr.wkbPoint)
+        geo.AddPoint_2D(coords[0], coords[1])
+        return geo
+
+    if gtype == 'MultiPoint':
+        geo = ogr.Geometry(ogr.wkbMultiPoint)
+        for xy in coords:
+            point = ogr.Geometry(ogr.wkbPoint)
+            point.AddPoint_2D(xy[0], xy[1])
+            geo.AddGeometry(point)
+
+        return geo
+
+    if gtype == 'LineString':
+        geo = ogr.Geometry(ogr.wkbLineString)
+        for xy in coords:
+            geo.AddPoint_2D(xy[0], xy[1])
+
+        return geo
+
+    if gtype == 'Polygon':
+        return _polygon_to_ogr(coords)
+
+    if gtype == 'MultiPolygon':
+        geo = ogr.Geometry(ogr.wkbMultiPolygon)
+        for polygon in coords:
+            geo.AddGeometry(_polygon_to_ogr(polygon))
+
+        return geo
+
+    return None
+
+
+def _get_geometry_from_geojson(geojson):
+    """
+    GeoJSON 文字列またはデコードした dict から
+    osgeo.ogr.Geometry オブジェクトを作成する。
+    """
+    if isinstance(geojson, str):
+        geoobj = json.loads(geojson)
+    else:
+        geoobj = geojson
+
+    if geoobj['type'] == 'FeatureCollection':
+        geodict = geoobj['features'][0]['geometry']
+    elif geoobj['type'] == 'Feature':
+        geodict = geoobj['geometry']
+    elif 'coordinates' in geoobj:  # geometry type
+        geodict = geoobj
+    else:
+        raise FilterError(
+            'geojson の種別を判定できませんでした: ' + json.dumps(geoobj))
+
+    geojson = json.dumps(geodict)
+    key = hashlib.blake2b(
+        geojson.encode('utf-8'), digest_size=16).digest()
+    cached_wkb = _geom_cache.get(key)
+    if cached_wkb is not None:
+        # WKB からの復元は GeoJSON の再解析よりも大幅に高速
+        return ogr.CreateGeometryFromWkb(cached_wkb)
+
+    # dict から直接組み立てて OGR 側での JSON 再解析を省略する
+    geo = _dict_to_ogr(geodict)
+    if geo is None:
+        geo = ogr.CreateGeometryFromJson(geojson)
+
+    if not geo:
+        raise FilterError('Cannot parse the given geojson: ' + geojson)
+
+    _geom_cache[key] = geo.ExportToWkb()
+    return geo
+
+
+def _get_geometry(geojson_or_url):
+    """
+    GeoJSON または GeoJSON ファイルを取得できる URL から
+    osgeo.ogr.Geometry オブジェクトを作成する。
+    """
+    if isinstance(geojson_or_url, ogr.Geometry):
+        # 解析済みの Geometry オブジェクトはそのまま利用する
+        return geojson_or_url
+
+    if isinstance(geojson_or_url, str):
+        try:
+            geojson = json.loads(geojson_or_url)
+            geo = _get_geometry_from_geojson(geojson)
+            return geo
+        except json.decoder.JSONDecodeError:
+            if not geojson_or_url.startswith(
+                    ('http://', 'https://', 'file://')):
+                # URL でない文字列のダウンロードを試みない
+                raise FilterError(
+                    'GeoJSON または URL として解析できません: '
+                    + geojson_or_url)
+
+            geo = _get_geometry_from_geojson_url(geojson_or_url)
+    else:
+        geo = _get_geometry_from_geojson(geojson_or_url)
+
+    return geo
+
+
+def _point_from_candidate(candidate):
+    """
+    候補ノードにふくまれる経度緯度座標から
+    Point タイプの osgeo.ogr.Geometry オブジェクトを作成する。
+    経度緯度が含まれていない場合は None を返す。
+    """
+    if candidate.geometry is None:
+        return None
+
+    geojson = json.dumps(candidate.geometry)
+    point = ogr.CreateGeometryFromJson(geojson)
+    return point
+
+
+def _xy_from_candidate(candidate):
+    """
+    候補ノードの経度緯度を表す tuple を取得する。
+    Point タイプのジオメトリを持たない場合は None を返す。
+
+    複数の空間フィルタを連続して適用する場合に座標の取り出しを
+    繰り返さないように、結果はノードの ``_attr['xy']`` に保持する。
+    """
+    attr = candidate._attr
+    if 'xy' in attr:
+        return attr['xy']
+
+    geometry = candidate.geometry
+    if geometry is None or geometry['type'] != 'Point':
+        xy = None
+    else:
+        coords = geometry['coordinates']
+        xy = (coords[0], coords[1])
+
+    attr['xy'] = xy
+    return xy
+
 
 class SpatialFilter(Filter):
     """
@@ -39,7 +319,12 @@ class SpatialFilter(Filter):
     そのノードの地点とします。
     """
 
-    def __init__(self, geojson_or_url, **kwargs):
+    # グリッドのセルの分類
+    GRID_OUTSIDE = 0
+    GRID_INSIDE = 1
+    GRID_BOUNDARY = 2
+
+    def __init__(self, geojson_or_url, grid_size=None, **kwargs):
         """
         フィルタを初期化します。
 
@@ -47,10 +332,55 @@ class SpatialFilter(Filter):
         ----------
         geojson_or_url : str
             空間範囲を表す GeoJSON　または GeoJSON ファイルを取得できる URL。
+        grid_size : int, optional
+            空間範囲を grid_size × grid_size のセルに分割して
+            分類した表を事前に作成し、判定を表引きで行ないます。
+            表の作成にはセル数に比例したジオメトリ演算が必要なので、
+            同じ空間範囲に対して判定を多数回繰り返す場合
+            （コンテキストを使い回して多数の記事を解析する場合など）
+            に指定してください。
         """
         super().__init__()
         self.when_all_failed = 'convert_to_normal'
-        self.geo = self.__class__.get_geometry(geojson_or_url)
+        self.geo = _get_geometry(geojson_or_url)
+        # 空間範囲のバウンディングボックス (minx, miny, maxx, maxy)。
+        # 範囲外の候補は浮動小数点の比較4回で除外できるため、
+        # ジオメトリ演算の前の粗い判定に利用する
+        minx, maxx, miny, maxy = self.geo.GetEnvelope()
+        self._bbox = (minx, miny, maxx, maxy)
+        # 候補ごとに Point オブジェクトを作成しないように、
+        # 判定用の Point オブジェクトを1つ作成して使い回す
+        self._probe = ogr.Geometry(ogr.wkbPoint)
+        self._probe.AddPoint_2D(0.0, 0.0)
+
+        # MultiPolygon の場合は構成ポリゴンごとの
+        # バウンディングボックスの一覧を作成しておき、
+        # 判定時には候補の座標を含むポリゴンだけを調べる
+        # （全ポリゴンを順にジオメトリ演算で試すことを避ける）
+        self._components = None
+        if self.geo.GetGeometryName() in (
+                'MULTIPOLYGON', 'GEOMETRYCOLLECTION'):
+            components = []
+            for i in range(self.geo.GetGeometryCount()):
+                subgeo = self.geo.GetGeometryRef(i).Clone()
+                minx, maxx, miny, maxy = subgeo.GetEnvelope()
+                components.append(((minx, miny, maxx, maxy), subgeo))
+
+            if len(components) > 1:
+                self._components = components
+
+        self._grid = None
+        self._grid_size = 0
+        if grid_size:
+            self._build_grid(int(grid_size))
+
+        if have_shapely:
+            # Shapely 2 の contains_xy / intersects_xy は
+            # Point オブジェクトを作成せずに経度緯度のまま判定できる
+            self._shapely_geo = _prepared_from_wkb(
+                bytes(self.geo.ExportToWkb()))
+        else:
+            self._shapely_geo = None
 
     @classmethod
     def get_geometry_from_geojson_url(cls, url):
@@ -75,19 +405,7 @@ class SpatialFilter(Filter):
         ...   'https://geoshape.ex.nii.ac.jp/city/geojson/20200101/13/13101A1968.geojson').ExportToWkt()
         'MULTIPOLYGON (((139.73150362 35.68150121,139.73119903 35.68198095,...,139.73150362 35.68150121)))'
         """
-        geo = None
-
-        try:
-            req = urllib.request.Request(url)
-            with urllib.request.urlopen(req) as res:
-                geojson = res.read().decode('utf-8')
-
-            geo = cls.get_geometry_from_geojson(geojson)
-
-        except RuntimeError as e:
-            raise FilterError(str(e))
-
-        return geo
+        return _get_geometry_from_geojson_url(url)
 
     @classmethod
     def get_geometry_from_geojson(cls, geojson):
@@ -113,26 +431,7 @@ class SpatialFilter(Filter):
         ... ).ExportToWkt()
         'POINT (139.6917337 35.6895014)'
         """
-        if isinstance(geojson, str):
-            geoobj = json.loads(geojson)
-        else:
-            geoobj = geojson
-
-        if geoobj['type'] == 'FeatureCollection':
-            geojson = json.dumps(geoobj['features'][0]['geometry'])
-        elif geoobj['type'] == 'Feature':
-            geojson = json.dumps(geoobj['geometry'])
-        elif 'coordinates' in geoobj:  # geometry type
-            geojson = json.dumps(geoobj)
-        else:
-            raise FilterError('geojson の種別を判定できませんでした: ' + geojson)
-
-        geo = ogr.CreateGeometryFromJson(geojson)
-
-        if not geo:
-            raise FilterError('Cannot parse the given geojson: ' + geojson)
-
-        return geo
+        return _get_geometry_from_geojson(geojson)
 
     @classmethod
     def get_geometry(cls, geojson_or_url):
@@ -159,17 +458,7 @@ class SpatialFilter(Filter):
         >>> SpatialFilter.get_geometry('https://geoshape.ex.nii.ac.jp/city/geojson/20200101/13/13101A1968.geojson').ExportToWkt()
         'MULTIPOLYGON (((139.73150362 35.68150121,139.73119903 35.68198095,...,139.73150362 35.68150121)))'
         """
-        if isinstance(geojson_or_url, str):
-            try:
-                geojson = json.loads(geojson_or_url)
-                geo = cls.get_geometry_from_geojson(geojson)
-                return geo
-            except json.decoder.JSONDecodeError:
-                geo = cls.get_geometry_from_geojson_url(geojson_or_url)
-        else:
-            geo = cls.get_geometry_from_geojson(geojson_or_url)
-
-        return geo
+        return _get_geometry(geojson_or_url)
 
     @classmethod
     def point_from_candidate(cls, candidate):
@@ -195,13 +484,195 @@ class SpatialFilter(Filter):
         >>> SpatialFilter.point_from_candidate(api.analyze('国会議事堂前')[0][0]).ExportToWkt()
         'POINT (139.745341666667 35.674845)'
         """
+        return _point_from_candidate(candidate)
+
+    def probe_from_candidate(self, candidate):
+        """
+        候補ノードにふくまれる経度緯度座標を、フィルタが所有する
+        判定用の Point オブジェクトにセットして返します。
+        経度緯度が含まれていない場合は None を返します。
+
+        ``point_from_candidate()`` と異なり新しい Geometry オブジェクトを
+        作成しないため、候補ごとの判定を高速に行なえます。
+        返されるオブジェクトは次の候補の判定で上書きされるので、
+        保持せずにすぐ利用してください。
+
+        Parameters
+        ----------
+        candidate : pygeonlp.api.node.Node
+            候補ノード。
+
+        Returns
+        -------
+        osgeo.ogr.Geometry
+            Point タイプの Geometry オブジェクト。
+        """
+        xy = _xy_from_candidate(candidate)
+        if xy is None:
+            if candidate.geometry is None:
+                return None
+
+            # Point 以外のジオメトリを持つ候補は新しくオブジェクトを作成する
+            return _point_from_candidate(candidate)
+
+        self._probe.SetPoint_2D(0, xy[0], xy[1])
+        return self._probe
+
+    def _build_grid(self, grid_size):
+        """
+        空間範囲のバウンディングボックスを grid_size × grid_size の
+        セルに分割し、各セルを「完全に範囲内」「完全に範囲外」
+        「境界を含む」のいずれかに分類した表を作成します。
+
+        境界を含まないセルの中の点はすべて同じ判定結果になるため、
+        判定時にはセル番号の計算と表引きだけで結果が決まり、
+        ジオメトリ演算が必要になるのは境界セルの候補だけです。
+        """
+        minx, miny, maxx, maxy = self._bbox
+        if maxx <= minx or maxy <= miny:
+            return   # 幅を持たない範囲には作成しない
+
+        boundary = self.geo.GetBoundary()
+        cell_w = (maxx - minx) / grid_size
+        cell_h = (maxy - miny) / grid_size
+        grid = bytearray(grid_size * grid_size)
+        for iy in range(grid_size):
+            y0 = miny + cell_h * iy
+            y1 = y0 + cell_h
+            for ix in range(grid_size):
+                x0 = minx + cell_w * ix
+                x1 = x0 + cell_w
+                rect = _polygon_to_ogr([[
+                    (x0, y0), (x1, y0), (x1, y1), (x0, y1), (x0, y0)]])
+                if boundary.Intersects(rect):
+                    state = self.GRID_BOUNDARY
+                elif self.geo.Intersects(rect):
+                    state = self.GRID_INSIDE
+                else:
+                    state = self.GRID_OUTSIDE
+
+                grid[iy * grid_size + ix] = state
+
+        self._grid = grid
+        self._grid_size = grid_size
+        self._grid_cell = (cell_w, cell_h)
+
+    def _grid_state(self, x, y):
+        """
+        指定した座標を含むセルの分類を返します。
+        バウンディングボックス内の座標を指定してください。
+        """
+        grid_size = self._grid_size
+        ix = int((x - self._bbox[0]) / self._grid_cell[0])
+        iy = int((y - self._bbox[1]) / self._grid_cell[1])
+        # 最大値側の辺上の座標は端のセルに含める
+        if ix >= grid_size:
+            ix = grid_size - 1
+
+        if iy >= grid_size:
+            iy = grid_size - 1
+
+        return self._grid[iy * grid_size + ix]
+
+    def _component_hits(self, x, y):
+        """
+        MultiPolygon を構成するポリゴンのうち、バウンディングボックスが
+        指定した座標を含むものを順に返します。
+        """
+        for (minx, miny, maxx, maxy), subgeo in self._components:
+            if minx <= x <= maxx and miny <= y <= maxy:
+                yield subgeo
 
-        if candidate.geometry is None:
-            return None
+    @classmethod
+    def lonlat_from_candidates(cls, candidates):
+        """
+        候補ノードのリストから、経度・緯度を列ごとにまとめた
+        配列 (Structure of Arrays) を作成します。
+
+        候補ごとの dict を順に辿るかわりに連続したメモリ上の配列を
+        判定処理に渡せるため、一括判定を高速に行なえます。
+
+        Parameters
+        ----------
+        candidates : list
+            候補ノードのリスト。
+
+        Returns
+        -------
+        tuple of numpy.ndarray, None
+            経度の配列、緯度の配列、座標を持つ候補かどうかを表す
+            bool の配列の tuple。
+            Point 以外のジオメトリを持つ候補が含まれる場合は
+            None を返します。
+        """
+        n = len(candidates)
+        lon = np.zeros(n, dtype=np.float64)
+        lat = np.zeros(n, dtype=np.float64)
+        has_point = np.zeros(n, dtype=bool)
+        for i, candidate in enumerate(candidates):
+            xy = _xy_from_candidate(candidate)
+            if xy is None:
+                if candidate.geometry is not None:
+                    return None
+
+                continue
 
-        geojson = json.dumps(candidate.geometry)
-        point = ogr.CreateGeometryFromJson(geojson)
-        return point
+            lon[i] = xy[0]
+            lat[i] = xy[1]
+            has_point[i] = True
+
+        return (lon, lat, has_point)
+
+    def filter_batch(self, candidates):
+        """
+        候補ノードのリストに対して、 ``filter_func()`` と同じ判定を
+        まとめて行ないます。
+
+        numpy パッケージがインストールされていない場合や、
+        Point 以外のジオメトリを持つ候補が含まれる場合は
+        候補ごとに ``filter_func()`` を呼び出します。
+
+        Parameters
+        ----------
+        candidates : list
+            検査対象となるノードオブジェクトのリスト。
+
+        Returns
+        -------
+        list, numpy.ndarray
+            候補ごとの合否を表す bool のシーケンス。
+        """
+        if not have_numpy:
+            return [self.filter_func(c) for c in candidates]
+
+        soa = self.__class__.lonlat_from_candidates(candidates)
+        if soa is None:
+            return [self.filter_func(c) for c in candidates]
+
+        lon, lat, has_point = soa
+        results = self.batch_func(lon, lat)
+        results[~has_point] = True   # 座標を持たない候補は合格
+        return results
+
+    def batch_func(self, lon, lat):
+        """
+        候補ノードの経度・緯度の配列に対して合否を判定します。
+        派生クラスでそれぞれ実装する必要があります。
+
+        Parameters
+        ----------
+        lon : numpy.ndarray
+            各候補の経度。
+        lat : numpy.ndarray
+            各候補の緯度。
+
+        Returns
+        -------
+        numpy.ndarray
+            候補ごとの合否を表す bool の配列。
+        """
+        raise NotImplementedError(
+            "batch_func() は派生クラスで実装してください。")
 
 
 class GeoContainsFilter(SpatialFilter):
@@ -253,18 +724,91 @@ class GeoContainsFilter(SpatialFilter):
 
     """
 
-    def __init__(self, geojson_or_url):
-        super().__init__(geojson_or_url)
+    def __init__(self, geojson_or_url, grid_size=None):
+        super().__init__(geojson_or_url, grid_size=grid_size)
 
     def filter_func(self, candidate):
-        point = self.__class__.point_from_candidate(candidate)
+        xy = _xy_from_candidate(candidate)
+        if xy is not None:
+            # バウンディングボックスの外の候補はジオメトリ演算なしで不合格
+            minx, miny, maxx, maxy = self._bbox
+            if not (minx <= xy[0] <= maxx and miny <= xy[1] <= maxy):
+                return False
+
+            if self._grid is not None:
+                # 境界セル以外は表引きだけで判定できる
+                state = self._grid_state(xy[0], xy[1])
+                if state != self.GRID_BOUNDARY:
+                    return state == self.GRID_INSIDE
+
+            if self._shapely_geo is not None:
+                return bool(shapely.contains_xy(
+                    self._shapely_geo, xy[0], xy[1]))
+
+        point = self.probe_from_candidate(candidate)
         if point is None:
             return True   # 座標を持たない候補は合格
 
+        if self._components is not None and xy is not None:
+            for subgeo in self._component_hits(xy[0], xy[1]):
+                if subgeo.Contains(point):
+                    return True
+
+            return False
+
         logger.debug("{} contains {} returns {}.".format(
             self.geo, point, self.geo.Contains(point)))
         return self.geo.Contains(point)
 
+    def batch_func(self, lon, lat):
+        """
+        空間範囲に含まれている候補をまとめて判定します。
+        """
+        # バウンディングボックス内の候補だけをジオメトリ演算で判定する
+        minx, miny, maxx, maxy = self._bbox
+        results = ((lon >= minx) & (lon <= maxx) &
+                   (lat >= miny) & (lat <= maxy))
+        inside = results.nonzero()[0]
+        if len(inside) == 0:
+            return results
+
+        if self._grid is not None:
+            # 境界セルの候補だけをジオメトリ演算に回す
+            unresolved = []
+            for i in inside:
+                state = self._grid_state(lon[i], lat[i])
+                if state == self.GRID_BOUNDARY:
+                    unresolved.append(i)
+                else:
+                    results[i] = (state == self.GRID_INSIDE)
+
+            if len(unresolved) == 0:
+                return results
+
+            inside = np.asarray(unresolved, dtype=np.int64)
+
+        if self._shapely_geo is not None:
+            results[inside] = shapely.contains_xy(
+                self._shapely_geo, lon[inside], lat[inside])
+            return results
+
+        probe = self._probe
+        if self._components is not None:
+            for i in inside:
+                probe.SetPoint_2D(0, lon[i], lat[i])
+                results[i] = any(
+                    subgeo.Contains(probe) for subgeo
+                    in self._component_hits(lon[i], lat[i]))
+
+            return results
+
+        contains = self.geo.Contains
+        for i in inside:
+            probe.SetPoint_2D(0, lon[i], lat[i])
+            results[i] = contains(probe)
+
+        return results
+
 
 class GeoDisjointFilter(SpatialFilter):
     """
@@ -314,12 +858,85 @@ class GeoDisjointFilter(SpatialFilter):
     ['。(NORMAL)']
     """
 
-    def __init__(self, geojson_or_url):
-        super().__init__(geojson_or_url)
+    def __init__(self, geojson_or_url, grid_size=None):
+        super().__init__(geojson_or_url, grid_size=grid_size)
 
     def filter_func(self, candidate):
-        point = self.__class__.point_from_candidate(candidate)
+        xy = _xy_from_candidate(candidate)
+        if xy is not None:
+            # バウンディングボックスの外の候補は必ず範囲外なので合格
+            minx, miny, maxx, maxy = self._bbox
+            if not (minx <= xy[0] <= maxx and miny <= xy[1] <= maxy):
+                return True
+
+            if self._grid is not None:
+                # 境界セル以外は表引きだけで判定できる
+                state = self._grid_state(xy[0], xy[1])
+                if state != self.GRID_BOUNDARY:
+                    return state != self.GRID_INSIDE
+
+            if self._shapely_geo is not None:
+                return not shapely.intersects_xy(
+                    self._shapely_geo, xy[0], xy[1])
+
+        point = self.probe_from_candidate(candidate)
         if point is None:
             return True  # 座標を持たない候補は合格
 
+        if self._components is not None and xy is not None:
+            for subgeo in self._component_hits(xy[0], xy[1]):
+                if not subgeo.Disjoint(point):
+                    return False
+
+            return True
+
         return self.geo.Disjoint(point)
+
+    def batch_func(self, lon, lat):
+        """
+        空間範囲に含まれていない候補をまとめて判定します。
+        """
+        # バウンディングボックス内の候補だけをジオメトリ演算で判定する
+        minx, miny, maxx, maxy = self._bbox
+        inside = ((lon >= minx) & (lon <= maxx) &
+                  (lat >= miny) & (lat <= maxy)).nonzero()[0]
+        results = np.ones(len(lon), dtype=bool)
+        if len(inside) == 0:
+            return results
+
+        if self._grid is not None:
+            # 境界セルの候補だけをジオメトリ演算に回す
+            unresolved = []
+            for i in inside:
+                state = self._grid_state(lon[i], lat[i])
+                if state == self.GRID_BOUNDARY:
+                    unresolved.append(i)
+                else:
+                    results[i] = (state != self.GRID_INSIDE)
+
+            if len(unresolved) == 0:
+                return results
+
+            inside = np.asarray(unresolved, dtype=np.int64)
+
+        if self._shapely_geo is not None:
+            results[inside] = ~shapely.intersects_xy(
+                self._shapely_geo, lon[inside], lat[inside])
+            return results
+
+        probe = self._probe
+        if self._components is not None:
+            for i in inside:
+                probe.SetPoint_2D(0, lon[i], lat[i])
+                results[i] = all(
+                    subgeo.Disjoint(probe) for subgeo
+                    in self._component_hits(lon[i], lat[i]))
+
+            return results
+
+        disjoint = self.geo.Disjoint
+        for i in inside:
+            probe.SetPoint_2D(0, lon[i], lat[i])
+            results[i] = disjoint(probe)
+
+        return results
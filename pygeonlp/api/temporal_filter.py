@@ -11,6 +11,64 @@ from pygeonlp.api.filter import Filter, FilterError
 
 logger = getLogger(__name__)
 
+try:
+    import numpy as np
+    have_numpy = True
+except ModuleNotFoundError:
+    logger.info(("numpy パッケージがインストールされていないため、"
+                 "時間フィルタの一括判定処理をスキップします。"))
+    have_numpy = False
+
+# 開始日・終了日が設定されていない候補の一括判定に利用する番兵値
+_ORD_MIN = datetime.date.min.toordinal() - 1
+_ORD_MAX = datetime.date.max.toordinal() + 1
+
+# 日付文字列の解析パターン、呼び出しごとに構築しないよう記憶
+_RE_DATE = re.compile(r"(\d{4})[/\-\s](\d{1,2})[/\-\s](\d{1,2})")
+
+
+# 各時間フィルタの判定関数。
+# 期間は通算日の整数で、 0 は開始日・終了日が設定されていないことを表す。
+# numba が利用できる環境では JIT コンパイルされる。
+
+def _time_exists(s0, s1, d0, d1):
+    if s0 > 0 and s0 > d1:
+        return False
+    if s1 > 0 and s1 < d0:
+        return False
+    return True
+
+
+def _time_before(s0, s1, d0, d1):
+    return not (s0 > 0 and s0 > d0)
+
+
+def _time_after(s0, s1, d0, d1):
+    return not (s1 > 0 and s1 < d1)
+
+
+def _time_covers(s0, s1, d0, d1):
+    if s0 > 0 and s0 > d0:
+        return False
+    if s1 > 0 and s1 < d1:
+        return False
+    return True
+
+
+def _time_contains(s0, s1, d0, d1):
+    return s0 > 0 and s0 >= d0 and s1 > 0 and s1 <= d1
+
+
+try:
+    from numba import njit
+    _time_exists = njit(cache=True)(_time_exists)
+    _time_before = njit(cache=True)(_time_before)
+    _time_after = njit(cache=True)(_time_after)
+    _time_covers = njit(cache=True)(_time_covers)
+    _time_contains = njit(cache=True)(_time_contains)
+except ModuleNotFoundError:
+    pass
+
 
 class TemporalFilter(Filter):
     """
@@ -54,6 +112,10 @@ class TemporalFilter(Filter):
         self.duration = self.__class__.get_duration_from_dates(
             date_from, date_to)
         self.when_all_failed = 'convert_to_normal'
+        # filter_func での日付比較を整数比較で行なうため、
+        # 期間の開始日と終了日の通算日も保持しておく
+        self._d0 = self.duration[0].toordinal()
+        self._d1 = self.duration[1].toordinal()
 
     @classmethod
     def get_date_from_isostr(cls, datestr):
@@ -74,9 +136,14 @@ class TemporalFilter(Filter):
         if datestr is None or datestr == '':
             return None
 
-        re_date = r"(\d{4})[/\-\s](\d{1,2})[/\-\s](\d{1,2})"
+        # 'YYYY-MM-DD' 形式は C 実装の fromisoformat() で解析する
+        if len(datestr) == 10:
+            try:
+                return datetime.date.fromisoformat(datestr)
+            except ValueError:
+                pass
 
-        match = re.match(re_date, datestr)
+        match = _RE_DATE.match(datestr)
         if not match:
             raise FilterError("'{}' は日付として解析できません".format(
                 datestr))
@@ -135,15 +202,116 @@ class TemporalFilter(Filter):
         候補ノードの valid_from, valid_to から有効期間を表す
         tuple を取得する。
         valid_from, valid_to が含まれていない場合は None を返す。
+
+        Note
+        ----
+        複数の時間フィルタを連続して適用する場合に同じ文字列を
+        何度も解析しないように、解析した結果はノードの
+        ``_attr['duration']`` に保持する。
         '''
         if candidate.prop is None:
             return None
 
+        if 'duration' in candidate._attr:
+            return candidate._attr['duration']
+
         prop = candidate.prop
         date0 = cls.get_date_from_isostr(prop.get('valid_from', None))
         date1 = cls.get_date_from_isostr(prop.get('valid_to', None))
 
-        return (date0, date1)
+        candidate._attr['duration'] = (date0, date1)
+        return candidate._attr['duration']
+
+    @classmethod
+    def ordinals_from_candidate(cls, candidate):
+        '''
+        候補ノードの valid_from, valid_to から有効期間の開始日と終了日の
+        通算日（ ``datetime.date.toordinal()`` ）を表す tuple を取得する。
+        valid_from, valid_to が含まれていない場合は None を返す。
+
+        filter_func では date オブジェクトの比較よりも高速な
+        整数比較を行なうため、こちらを利用する。
+
+        Note
+        ----
+        解析した結果はノードの ``_attr['duration_ordinals']`` に保持する。
+        '''
+        if candidate.prop is None:
+            return None
+
+        if 'duration_ordinals' in candidate._attr:
+            return candidate._attr['duration_ordinals']
+
+        span = cls.duration_from_candidate(candidate)
+        ordinals = (
+            span[0].toordinal() if span[0] else None,
+            span[1].toordinal() if span[1] else None,
+        )
+        candidate._attr['duration_ordinals'] = ordinals
+        return ordinals
+
+    def filter_batch(self, candidates):
+        """
+        候補ノードのリストに対して、 ``filter_func()`` と同じ判定を
+        NumPy の配列演算でまとめて行ないます。
+
+        numpy パッケージがインストールされていない場合は
+        候補ごとに ``filter_func()`` を呼び出します。
+
+        Parameters
+        ----------
+        candidates : list
+            検査対象となるノードオブジェクトのリスト。
+
+        Returns
+        -------
+        list, numpy.ndarray
+            候補ごとの合否を表す bool のシーケンス。
+        """
+        if not have_numpy:
+            return [self.filter_func(c) for c in candidates]
+
+        n = len(candidates)
+        s0 = np.empty(n, dtype=np.int64)
+        s1 = np.empty(n, dtype=np.int64)
+        has_span = np.empty(n, dtype=bool)
+        ordinals_from_candidate = self.__class__.ordinals_from_candidate
+        for i, candidate in enumerate(candidates):
+            span = ordinals_from_candidate(candidate)
+            if span is None:
+                s0[i] = _ORD_MIN
+                s1[i] = _ORD_MAX
+                has_span[i] = False
+            else:
+                s0[i] = span[0] if span[0] else _ORD_MIN
+                s1[i] = span[1] if span[1] else _ORD_MAX
+                has_span[i] = True
+
+        results = self.batch_func(s0, s1)
+        results[~has_span] = True   # 期間を持たない候補は合格
+        return results
+
+    def batch_func(self, s0, s1):
+        """
+        候補ノードの期間を表す通算日の配列に対して合否を判定します。
+        派生クラスでそれぞれ実装する必要があります。
+
+        Parameters
+        ----------
+        s0 : numpy.ndarray
+            各候補の期間の開始日の通算日。
+            開始日を持たない場合は十分小さな番兵値。
+        s1 : numpy.ndarray
+            各候補の期間の終了日の通算日。
+            終了日を持たない場合は十分大きな番兵値。
+
+        Returns
+        -------
+        numpy.ndarray
+            候補ごとの合否を表す bool の配列。
+        """
+        raise NotImplementedError(
+            "batch_func() は派生クラスで実装してください。")
 
 
 class TimeExistsFilter(TemporalFilter):
@@ -225,17 +393,18 @@ class TimeExistsFilter(TemporalFilter):
         bool
             フィルタの条件を満たせば True, 満たさなければ False を返します。
         """
-        span = self.__class__.duration_from_candidate(candidate)
+        span = self.__class__.ordinals_from_candidate(candidate)
         if span is None:
             return True   # 期間を持たない候補は合格
 
-        if span[0] and span[0] > self.duration[1]:
-            return False
+        return _time_exists(
+            span[0] or 0, span[1] or 0, self._d0, self._d1)
 
-        if span[1] and span[1] < self.duration[0]:
-            return False
-
-        return True
+    def batch_func(self, s0, s1):
+        """
+        時間範囲に存在している候補をまとめて判定します。
+        """
+        return (s0 <= self._d1) & (s1 >= self._d0)
 
 
 class TimeBeforeFilter(TemporalFilter):
@@ -313,14 +482,18 @@ class TimeBeforeFilter(TemporalFilter):
         bool
             フィルタの条件を満たせば True, 満たさなければ False を返します。
         """
-        span = self.__class__.duration_from_candidate(candidate)
+        span = self.__class__.ordinals_from_candidate(candidate)
         if span is None:
             return True   # 期間を持たない候補は合格
 
-        if span[0] and span[0] > self.duration[0]:
-            return False
+        return _time_before(
+            span[0] or 0, span[1] or 0, self._d0, self._d1)
 
-        return True
+    def batch_func(self, s0, s1):
+        """
+        時間範囲の開始時より前に存在している候補をまとめて判定します。
+        """
+        return s0 <= self._d0
 
 
 class TimeAfterFilter(TemporalFilter):
@@ -398,14 +571,18 @@ class TimeAfterFilter(TemporalFilter):
         bool
             フィルタの条件を満たせば True, 満たさなければ False を返します。
         """
-        span = self.__class__.duration_from_candidate(candidate)
+        span = self.__class__.ordinals_from_candidate(candidate)
         if span is None:
             return True   # 期間を持たない候補は合格
 
-        if span[1] and span[1] < self.duration[1]:
-            return False
+        return _time_after(
+            span[0] or 0, span[1] or 0, self._d0, self._d1)
 
-        return True
+    def batch_func(self, s0, s1):
+        """
+        時間範囲の終了時より後に存在している候補をまとめて判定します。
+        """
+        return s1 >= self._d1
 
 
 class TimeOverlapsFilter(TemporalFilter):
@@ -488,17 +665,18 @@ class TimeOverlapsFilter(TemporalFilter):
         bool
             フィルタの条件を満たせば True, 満たさなければ False を返します。
         """
-        span = self.__class__.duration_from_candidate(candidate)
+        span = self.__class__.ordinals_from_candidate(candidate)
         if span is None:
             return True   # 期間を持たない候補は合格
 
-        if span[0] and span[0] > self.duration[1]:
-            return False
+        return _time_exists(
+            span[0] or 0, span[1] or 0, self._d0, self._d1)
 
-        if span[1] and span[1] < self.duration[0]:
-            return False
-
-        return True
+    def batch_func(self, s0, s1):
+        """
+        時間範囲内に存在している候補をまとめて判定します。
+        """
+        return (s0 <= self._d1) & (s1 >= self._d0)
 
 
 class TimeCoversFilter(TemporalFilter):
@@ -577,17 +755,18 @@ class TimeCoversFilter(TemporalFilter):
         bool
             フィルタの条件を満たせば True, 満たさなければ False を返します。
         """
-        span = self.__class__.duration_from_candidate(candidate)
+        span = self.__class__.ordinals_from_candidate(candidate)
         if span is None:
             return True   # 期間を持たない候補は合格
 
-        if span[0] and span[0] > self.duration[0]:
-            return False
+        return _time_covers(
+            span[0] or 0, span[1] or 0, self._d0, self._d1)
 
-        if span[1] and span[1] < self.duration[1]:
-            return False
-
-        return True
+    def batch_func(self, s0, s1):
+        """
+        時間範囲の開始時から終了時まで存在している候補をまとめて判定します。
+        """
+        return (s0 <= self._d0) & (s1 >= self._d1)
 
 
 class TimeContainsFilter(TemporalFilter):
@@ -671,12 +850,20 @@ class TimeContainsFilter(TemporalFilter):
         bool
             フィルタの条件を満たせば True, 満たさなければ False を返します。
         """
-        span = self.__class__.duration_from_candidate(candidate)
-        if span is None:
+        prop = candidate.prop
+        if prop is None:
             return True   # 期間を持たない候補は合格
 
-        if span[0] and span[0] >= self.duration[0] and \
-           span[1] and span[1] <= self.duration[1]:
-            return True
+        if not prop.get('valid_from') or not prop.get('valid_to'):
+            # どちらかが未指定の候補は日付を解析するまでもなく不合格
+            return False
 
-        return False
+        span = self.__class__.ordinals_from_candidate(candidate)
+        return _time_contains(
+            span[0] or 0, span[1] or 0, self._d0, self._d1)
+
+    def batch_func(self, s0, s1):
+        """
+        時間範囲の開始時と終了時の間だけ存在している候補をまとめて判定します。
+        """
+        return (s0 >= self._d0) & (s1 <= self._d1)
@@ -1,3 +1,7 @@
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+import json
 import logging
 
 from pygeonlp.api.parser import Parser
@@ -7,6 +11,43 @@ from pygeonlp.api.node import Node
 
 logger = logging.getLogger(__name__)
 
+try:
+    import numpy as np
+    have_numpy = True
+except ModuleNotFoundError:
+    logger.info(("numpy パッケージがインストールされていないため、"
+                 "ラティス分割処理の高速化をスキップします。"))
+    have_numpy = False
+
+
+def _combos_below(widths, pos_from, pos_to, max_combinations):
+    """
+    ラティスの [pos_from, pos_to) 区間の組み合わせ数が
+    max_combinations 未満かどうかを判定します。
+
+    widths にはラティスの各位置の候補ノード数を格納しておきます。
+    組み合わせ数がしきい値に達した時点で打ち切るため、
+    数え上げてから比較するよりも高速です。
+    numba が利用できる環境では JIT コンパイルされます。
+    """
+    n = 1
+    for i in range(pos_from, pos_to):
+        n *= widths[i]
+        if n >= max_combinations:
+            return False
+
+    return True
+
+
+try:
+    from numba import njit
+    _combos_below = njit(cache=True)(_combos_below)
+except ModuleNotFoundError:
+    pass
+
+# ラティスの分割位置とみなす記号
+_SPLIT_SYMBOLS = frozenset('／/★●○◎■□◇')
+
 
 class WorkflowError(RuntimeError):
     """
@@ -61,16 +102,56 @@ class Workflow(object):
         filters: list
             適用するフィルタオブジェクトのリスト。
             省略した場合は InputBasedFilter がセットされます。
+        evaluate_with_threads: bool
+            分割したラティスの評価をスレッドで並列実行するかどうか。
+            デフォルトの Evaluator はほぼ純 Python の処理で GIL を
+            解放しないため、デフォルトは False です。
+            GIL を解放するスコアリングクラスを利用する場合に
+            True を指定してください。
         """
+        self.evaluate_with_threads = options.pop(
+            'evaluate_with_threads', False)
         self.parser = Parser(
             db_dir=db_dir,
             address_regex=address_regex,
             jageocoder=jageocoder, **options)
+        # 同じ文を繰り返し解析する場合に備えて geoparse の結果を
+        # インスタンスごとにキャッシュする
+        self._geoparse_cached = lru_cache(maxsize=4096)(
+            self._geoparse_to_json)
         self.filters = filters or [InputBasedFilter()]
         self.evaluator = Evaluator(
             scoring_class=scoring_class,
             scoring_options=scoring_options,
             max_results=1, max_combinations=MAX_COMBINATIONS)
+        # 分割位置の種別判定関数を特殊化して作成する
+        self._classify_split_node = self._make_split_classifier()
+
+    @property
+    def filters(self):
+        return self._filters
+
+    @filters.setter
+    def filters(self, filters):
+        # フィルタはキャッシュ対象の _geoparse_to_json の中で
+        # 適用されるため、変更するとキャッシュ済みの結果は無効になる
+        self._geoparse_cached.cache_clear()
+        self._filters = filters
+
+    def set_jageocoder(self, jageocoder):
+        """
+        この Workflow が利用する jageocoder を変更します。
+
+        Parameters
+        ----------
+        jageocoder : jageocoder.tree.AddressTree, optional
+            利用する住所ジオコーダーを指定します。
+            False を指定した場合、ジオコーディング機能を利用しません。
+        """
+        # 住所候補はキャッシュ対象の _geoparse_to_json の中で
+        # 追加されるため、変更するとキャッシュ済みの結果は無効になる
+        self._geoparse_cached.cache_clear()
+        self.parser.set_jageocoder(jageocoder)
 
     def geoparse(self, sentence: str):
         """
@@ -94,6 +175,61 @@ class Workflow(object):
         >>> workflow = api.workflow.Workflow()
         >>> workflow.geoparse('国会議事堂前まで歩きました。')
         [{'type': 'Feature', 'geometry': {'type': 'Point', 'coordinates': [139.74305333333334, 35.673543333333335]}, 'properties': {'surface': '国会議事堂前', 'node_type': 'GEOWORD', 'morphemes': {'conjugated_form': '*', 'conjugation_type': '*', 'original_form': '国会議事堂前', 'pos': '名詞', 'prononciation': '', 'subclass1': '固有名詞', 'subclass2': '地名語', 'subclass3': 'cE8W4w:国会議事堂前駅', 'surface': '国会議事堂前', 'yomi': ''}, 'geoword_properties': {'body': '国会議事堂前', 'dictionary_id': 3, 'entry_id': '4NFELa', 'geolod_id': 'cE8W4w', 'hypernym': ['東京地下鉄', '9号線千代田線'], 'institution_type': '民営鉄道', 'latitude': '35.673543333333335', 'longitude': '139.74305333333334', 'ne_class': '鉄道施設/鉄道駅', 'railway_class': '普通鉄道', 'suffix': ['駅', ''], 'dictionary_identifier': 'geonlp:ksj-station-N02'}}}, {'type': 'Feature', 'geometry': None, 'properties': {'surface': 'まで', 'node_type': 'NORMAL', 'morphemes': {'conjugated_form': '*', 'conjugation_type': '*', 'original_form': 'まで', 'pos': '助詞', 'prononciation': 'マデ', 'subclass1': '副助詞', 'subclass2': '*', 'subclass3': '*', 'surface': 'まで', 'yomi': 'マデ'}}}, {'type': 'Feature', 'geometry': None, 'properties': {'surface': '歩き', 'node_type': 'NORMAL', 'morphemes': {'conjugated_form': '五段・カ行イ音便', 'conjugation_type': '連用形', 'original_form': '歩く', 'pos': '動詞', 'prononciation': 'アルキ', 'subclass1': '自立', 'subclass2': '*', 'subclass3': '*', 'surface': '歩き', 'yomi': 'アルキ'}}}, {'type': 'Feature', 'geometry': None, 'properties': {'surface': 'まし', 'node_type': 'NORMAL', 'morphemes': {'conjugated_form': '特殊・マス', 'conjugation_type': '連用形', 'original_form': 'ます', 'pos': '助動詞', 'prononciation': 'マシ', 'subclass1': '*', 'subclass2': '*', 'subclass3': '*', 'surface': 'まし', 'yomi': 'マシ'}}}, {'type': 'Feature', 'geometry': None, 'properties': {'surface': 'た', 'node_type': 'NORMAL', 'morphemes': {'conjugated_form': '特殊・タ', 'conjugation_type': '基本形', 'original_form': 'た', 'pos': '助動詞', 'prononciation': 'タ', 'subclass1': '*', 'subclass2': '*', 'subclass3': '*', 'surface': 'た', 'yomi': 'タ'}}}, {'type': 'Feature', 'geometry': None, 'properties': {'surface': '。', 'node_type': 'NORMAL', 'morphemes': {'conjugated_form': '*', 'conjugation_type': '*', 'original_form': '。', 'pos': '記号', 'prononciation': '。', 'subclass1': '句点', 'subclass2': '*', 'subclass3': '*', 'surface': '。', 'yomi': '。'}}}]
+        Note
+        ----
+        同じ文を解析した結果はキャッシュされるため、繰り返し
+        呼びだした場合は解析処理を省略して結果を返します。
+        利用する辞書や固有名クラスを変更するとキャッシュは無効になります。
+        """
+        dict_fp = tuple(sorted(
+            x.get_identifier() for x in self.getActiveDictionaries()))
+        class_fp = tuple(self.getActiveClasses())
+        return json.loads(self._geoparse_cached(sentence, dict_fp, class_fp))
+
+    def geoparse_batch(self, sentences, n_workers=None):
+        """
+        複数の文をワーカープロセスに分配して並列にジオパースします。
+
+        文ごとの解析は独立しているため、文の数が多い場合は
+        CPU コア数に応じた高速化が期待できます。
+        各ワーカープロセスは初期化時に一度だけ辞書データベースを
+        読み込みます。
+
+        Parameters
+        ----------
+        sentences: list of str
+            解析する文字列のリスト。
+        n_workers: int, optional
+            ワーカープロセス数。省略した場合は CPU 数を利用します。
+
+        Returns
+        -------
+        list
+            ``geoparse()`` の結果を入力の文と同じ順に並べたリスト。
+
+        Note
+        ----
+        ワーカープロセスの Workflow は、この Workflow と同じ
+        データベースディレクトリとデフォルトのオプションで作成されます。
+        文の数が少ない場合はプロセス起動のオーバーヘッドの方が
+        大きくなるため、``geoparse()`` を直接呼びだしてください。
+        """
+        with ProcessPoolExecutor(
+                max_workers=n_workers,
+                initializer=_worker_init,
+                initargs=(self.parser.service.db_dir,)) as executor:
+            return list(executor.map(
+                _worker_geoparse, sentences, chunksize=32))
+
+    def _geoparse_to_json(self, sentence, dict_fp, class_fp):
+        """
+        キャッシュを介さずにジオパース処理を実行し、
+        結果を JSON 文字列として返します。
+
+        dict_fp, class_fp は利用中の辞書と固有名クラスを表す
+        フィンガープリントで、キャッシュのキーとしてのみ利用します。
+        キャッシュした結果を呼びだし側が書き換えても影響が残らないように、
+        JSON 文字列として保持し、利用時にデコードします。
         """
         lattice = self.parser.analyze_sentence(sentence)
 
@@ -104,23 +240,38 @@ class Workflow(object):
         # 住所候補を追加
         lattice = self.parser.add_address_candidates(lattice)
 
-        # 処理可能な長さに分割したラティスをパス表現に変換
-        results = []
-        for lattice_part in self.get_processible_lattice_part(lattice):
-            if len(lattice_part) < 1:
-                continue    # 空行
-
-            results += self.evaluator.get(lattice_part)
+        # スコアリングで共有する情報を一度だけ事前計算
+        self.evaluator.prepare(lattice)
 
-        features = []
-        for result in results:
-            nodes = result['result']
-            for node in nodes:
-                features.append(node.as_geojson())
-
-        return features
+        # 処理可能な長さに分割したラティスをパス表現に変換
+        # 分割判定に利用する情報はここで一度だけ収集する
+        widths, boundaries, steps = self._scan_lattice(lattice)
+        lattice_parts = [
+            lattice_part for lattice_part in self.get_processible_lattice_part(
+                lattice, widths, boundaries, steps)
+            if len(lattice_part) >= 1]  # 空行は除く
 
-    def get_processible_lattice_part(self, lattice):
+        results = []
+        if self.evaluate_with_threads and len(lattice_parts) > 1:
+            # 分割したラティスは互いに独立なので並列に評価できる
+            with ThreadPoolExecutor(
+                    max_workers=min(4, len(lattice_parts))) as executor:
+                for result in executor.map(
+                        self.evaluator.get, lattice_parts):
+                    results += result
+        else:
+            for lattice_part in lattice_parts:
+                results += self.evaluator.get(lattice_part)
+
+        features = [
+            node.as_geojson()
+            for result in results
+            for node in result['result']]
+
+        return json.dumps(features, ensure_ascii=False)
+
+    def get_processible_lattice_part(self, lattice, widths=None,
+                                     boundaries=None, steps=None):
         """
         組み合わせの候補数が MAX_COMBINATIONS 未満になるように
         ラティスの先頭部分から区切りの良い一部分を抽出するジェネレータ。
@@ -129,6 +280,15 @@ class Workflow(object):
         ----------
         lattice: list
             入力となるラティス表現。
+        widths: list, numpy.ndarray, optional
+            ラティスの各位置の候補ノード数。
+        boundaries: list, optional
+            分割可能な位置のリスト。
+        steps: list, numpy.ndarray, optional
+            ラティスの各位置から次の位置までの幅
+            （住所ブロックの先頭では住所に含まれる形態素数）。
+            widths, boundaries, steps を省略した場合は
+            ``_scan_lattice()`` を呼びだして収集します。
 
         Return
         ------
@@ -146,17 +306,28 @@ class Workflow(object):
         pos_from = 0
         pos_to = len(lattice)
 
+        if widths is None or boundaries is None or steps is None:
+            widths, boundaries, steps = self._scan_lattice(lattice)
+
+        # 短い文や候補にあいまいさの無い文（よくあるケース）では
+        # 分割は発生しないので、組み合わせ数を計算せずにそのまま返す
+        if len(lattice) == 1 or \
+                (len(lattice) > 0 and max(widths) == 1):
+            yield lattice
+            return
+
         while pos_from < len(lattice):
             lattice_part = lattice[pos_from:pos_to]
             if pos_to - pos_from == 1 or \
-                    self.evaluator.count_combinations(
-                        lattice_part) < MAX_COMBINATIONS:
-                logger.debug("--- pos {} - {}".format(pos_from, pos_to))
-                for i in range(pos_from, pos_to):
-                    nodes = lattice[i]
-                    logger.debug("{}:'{}' has {} nodes".format(
-                        i, nodes[0].surface, len(nodes)))
-                logger.debug("---")
+                    _combos_below(
+                        widths, pos_from, pos_to, MAX_COMBINATIONS):
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("--- pos %d - %d", pos_from, pos_to)
+                    for i in range(pos_from, pos_to):
+                        nodes = lattice[i]
+                        logger.debug("%d:'%s' has %d nodes",
+                                     i, nodes[0].surface, len(nodes))
+                    logger.debug("---")
                 yield lattice_part
 
                 pos_from = pos_to
@@ -164,104 +335,166 @@ class Workflow(object):
                 continue
 
             # 組み合わせ数が多すぎるので分割する
+            # 句点・改行・記号・読点の優先順に、
+            # 現在の範囲内で最も先頭に近い分割位置を二分探索で探す
             eliminated = False
-
-            # 句点で分割してみる
-            for i in range(pos_from, pos_to - 1):
-                node = lattice[i][0]  # i 番目のノード集合の先頭
-                if node.node_type != Node.ADDRESS and \
-                        node.morphemes['subclass1'] == '句点':
-                    pos_to = i + 1
+            for positions in boundaries:
+                i = bisect_left(positions, pos_from)
+                if i < len(positions) and positions[i] < pos_to - 1:
+                    pos_to = positions[i] + 1
                     eliminated = True
                     break
 
             if eliminated:
                 continue
 
-            # 改行で分割してみる
-            for i in range(pos_from, pos_to - 1):
-                node = lattice[i][0]  # i 番目のノード集合の先頭
-                if node.node_type != Node.ADDRESS and \
-                    self.parser.check_word(
-                        node.morphemes,
-                        {'pos': '記号',
-                         'subclass1': '制御コード',
-                                      'subclass2': '改行'}):
-                    pos_to = i + 1
-                    eliminated = True
+            # 半分にする、ただし住所表現は分割しない
+            # 住所ブロックの幅は steps に収集済みなので
+            # ノードを再走査せずに中間点の次の区切りを求められる
+            i = pos_from
+            mid = pos_from + (pos_to - pos_from) // 2
+            while i < pos_to:
+                logger.debug('半分 i=%d, pos_from=%d, pos_to=%d',
+                             i, pos_from, pos_to)
+                if i >= mid:
+                    pos_to = i
                     break
 
-            if eliminated:
-                continue
+                i += steps[i]
 
-            # 記号で分割してみる
-            for i in range(pos_from, pos_to - 1):
-                node = lattice[i][0]  # i 番目のノード集合の先頭
-                if node.node_type != Node.ADDRESS and \
-                    self.parser.check_word(node.morphemes,
-                                           {'pos': '記号',
-                                            'subclass1': '一般'}) and \
-                        node.surface in ('／/★●○◎■□◇'):
-                    pos_to = i + 1
-                    eliminated = True
-                    break
+    def _make_split_classifier(self):
+        """
+        分割位置の種別を判定する関数を作成します。
 
-            if eliminated:
-                continue
+        判定に利用する定数やメソッドをローカル変数に束縛した
+        クロージャを返すことで、一行ごとの判定コストを下げます。
+        返される関数はノードを受け取り、句点 0・改行 1・記号 2・
+        読点 3 の優先度を、分割できない場合は -1 を返します。
+        """
+        ADDRESS = Node.ADDRESS
+        split_symbols = _SPLIT_SYMBOLS
 
-            # 読点で分割してみる
-            for i in range(pos_from, pos_to - 1):
-                node = lattice[i][0]  # i 番目のノード集合の先頭
-                if node.node_type != Node.ADDRESS and \
-                        node.morphemes['subclass1'] == '読点':
-                    pos_to = i + 1
-                    eliminated = True
-                    break
+        def classify(node):
+            if node.node_type == ADDRESS:
+                return -1
 
-            if eliminated:
-                continue
+            subclass1 = node._sub1
+            if subclass1 == '句点':
+                return 0
 
-            # 半分にする、ただし住所表現は分割しない
-            i = pos_from
-            while i < pos_to:
-                logger.debug(
-                    '半分 i={i}, pos_from={pos_from}, pos_to={pos_to}'.format(
-                        i=i, pos_from=pos_from, pos_to=pos_to))
-                if i >= pos_from + int((pos_to - pos_from) / 2):
-                    pos_to = i
+            if subclass1 == '制御コード':
+                if node._pos == '記号' and \
+                        node.morphemes.get('subclass2') == '改行':
+                    return 1
+                return -1
+
+            if subclass1 == '一般':
+                if node._pos == '記号' and node.surface in split_symbols:
+                    return 2
+                return -1
+
+            if subclass1 == '読点':
+                return 3
+
+            return -1
+
+        return classify
+
+    def _scan_lattice(self, lattice):
+        """
+        ラティスを一度だけ走査して、分割判定に必要な情報を収集します。
+
+        ``get_processible_lattice_part()`` が組み合わせ数の計算と
+        分割位置の二分探索に利用します。
+
+        Parameters
+        ----------
+        lattice: list
+            入力となるラティス表現。
+
+        Return
+        ------
+        tuple
+            各位置の候補ノード数のシーケンス、句点・改行・記号・読点の
+            優先順に分割位置（昇順）のリストを格納したリスト、
+            各位置から次の位置までの幅のシーケンスのタプル。
+            シーケンスは numpy が利用できる場合は int64 配列です。
+        """
+        if have_numpy:
+            widths = np.empty(len(lattice), dtype=np.int64)
+            steps = np.ones(len(lattice), dtype=np.int64)
+        else:
+            widths = [1] * len(lattice)
+            steps = [1] * len(lattice)
+
+        classify = self._classify_split_node
+        # 句点・改行・記号・読点の優先順
+        boundaries = [[], [], [], []]
+        for i, nodes in enumerate(lattice):
+            widths[i] = len(nodes)
+
+            has_non_address_node = False
+            for node in nodes:
+                if node.node_type != Node.ADDRESS:
+                    has_non_address_node = True
                     break
 
-                has_non_address_node = False
-                for node in lattice[i]:
-                    if node.node_type != Node.ADDRESS:
-                        has_non_address_node = True
+            if has_non_address_node:
+                # 住所ノード以外も保存されている場合、
+                # 半分化の際に住所ブロックを分割しないように
+                # 住所に含まれる形態素数をステップ幅として記録する
+                for node in nodes:
+                    if isinstance(node.morphemes, list):
+                        # 住所ノードは複数の形態素を含む
+                        steps[i] = len(node.morphemes)
                         break
 
-                node_width = 1
-                if has_non_address_node:
-                    # 住所ノード以外も保存されている場合
-                    for node in lattice[i]:
-                        if isinstance(node.morphemes, list):
-                            # 住所ノードは複数の形態素を含む
-                            node_width = len(node.morphemes)
-                            break
+            # i 番目のノード集合の先頭で分割できるかを調べる
+            priority = classify(nodes[0])
+            if priority >= 0:
+                boundaries[priority].append(i)
 
-                i += node_width
+        return widths, boundaries, steps
 
     def getActiveDictionaries(self):
         return self.parser.service.getActiveDictionaries()
 
     def setActiveDictionaries(self, idlist=None, pattern=None):
+        self._geoparse_cached.cache_clear()
         return self.parser.service.setActiveDictionaries(idlist, pattern)
 
     def disactivateDictionaries(self, idlist=None, pattern=None):
+        self._geoparse_cached.cache_clear()
         return self.parser.service.disactivateDictionaries(idlist, pattern)
 
     def activateDictionaries(self, idlist=None, pattern=None):
+        self._geoparse_cached.cache_clear()
         return self.parser.service.activateDictionaries(idlist, pattern)
 
     def getActiveClasses(self):
         return self.parser.service.getActiveClasses()
 
     def setActiveClasses(self, patterns=None):
+        self._geoparse_cached.cache_clear()
         return self.parser.service.setActiveClasses(patterns)
+
+
+# geoparse_batch() のワーカープロセスが利用する Workflow
+_worker_workflow = None
+
+
+def _worker_init(db_dir=None):
+    """
+    ワーカープロセスの初期化処理。
+    プロセスごとに一度だけ Workflow を作成し、
+    辞書データベースを読み込みます。
+    """
+    global _worker_workflow
+    _worker_workflow = Workflow(db_dir=db_dir)
+
+
+def _worker_geoparse(sentence):
+    """
+    ワーカープロセス内の Workflow で一つの文をジオパースします。
+    """
+    return _worker_workflow.geoparse(sentence)
@@ -15,12 +15,14 @@ Usage: python context.py
 - ContextFilter, ContextEvaluator を利用する ContextWorkflow
 """
 
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
 from logging import getLogger
 import os
 import re
 from typing import Optional, Union
 
-from pygeonlp.api.linker import Evaluator
+from pygeonlp.api.linker import Evaluator, LinkedResults, LinkerError
 from pygeonlp.api.filter import Filter
 from pygeonlp.api.node import Node
 from pygeonlp.api.scoring import ScoringClass
@@ -29,6 +31,11 @@ from pygeonlp.api.workflow import Workflow
 
 logger = getLogger(__name__)
 
+# 構築済みの空間フィルタのキャッシュ。
+# 同じ空間的範囲を対象とする Context が複数作られた場合にも、
+# GeoJSON の解析とセル分割表の構築を1回にまとめる
+_area_filter_cache = {}
+
 
 class Context(object):
     """
@@ -51,11 +58,74 @@ class Context(object):
         """
         コンテキスト情報を初期化
         """
+        # 優先度の計算結果のキャッシュ
+        # (ne_class, has_prefix, has_suffix) → 優先度
+        self._cache = {}
         self.target_area = None
+        self._area_filter = None
         self.priorities = {}
         self.priorities_with_prefix = {}
         self.priorities_with_suffix = {}
 
+    @staticmethod
+    def _compile_priorities(priorities: dict) -> tuple:
+        """
+        優先度 dict のキーの固有名クラス正規表現を
+        代入時に一度だけ、全キーを選択肢として含む
+        1 つの正規表現にまとめてコンパイルする
+
+        各キーをグループで囲んでいるので、マッチ結果の lastindex
+        からどのキーにマッチしたかが 1 回のマッチングで分かります
+        （キーは dict の順に試されるため、ループで順に調べる場合と
+        同じキーが選択されます）。
+
+        キー自体がグループを含む正規表現の場合、lastindex は
+        キー内部のグループを指すことがあります。キーのグループ番号は
+        昇順で、内部のグループの番号は次のキーのグループ番号より
+        小さいため、二分探索でどのキーにマッチしたかを特定できます。
+        """
+        if not priorities:
+            return (None, [], [])
+
+        combined = re.compile('|'.join(
+            '(?P<g{}>{})'.format(i, ne_class)
+            for i, ne_class in enumerate(priorities.keys())))
+        group_nums = [combined.groupindex['g{}'.format(i)]
+                      for i in range(len(priorities))]
+        return (combined, list(priorities.values()), group_nums)
+
+    @property
+    def priorities(self) -> dict:
+        return self._priorities
+
+    @priorities.setter
+    def priorities(self, priorities: dict):
+        self._priorities = priorities
+        self._priorities_compiled = self._compile_priorities(priorities)
+        self._cache.clear()
+
+    @property
+    def priorities_with_prefix(self) -> dict:
+        return self._priorities_with_prefix
+
+    @priorities_with_prefix.setter
+    def priorities_with_prefix(self, priorities: dict):
+        self._priorities_with_prefix = priorities
+        self._priorities_with_prefix_compiled = \
+            self._compile_priorities(priorities)
+        self._cache.clear()
+
+    @property
+    def priorities_with_suffix(self) -> dict:
+        return self._priorities_with_suffix
+
+    @priorities_with_suffix.setter
+    def priorities_with_suffix(self, priorities: dict):
+        self._priorities_with_suffix = priorities
+        self._priorities_with_suffix_compiled = \
+            self._compile_priorities(priorities)
+        self._cache.clear()
+
     def setArea(self, geojson_or_url: Union[str, bytes, os.PathLike]):
         """
         空間的範囲をセットする
@@ -67,6 +137,33 @@ class Context(object):
             GeoJSON を含む URL
         """
         self.target_area = geojson_or_url
+        self._area_filter = None
+
+    def get_area_filter(self) -> Optional[GeoContainsFilter]:
+        """
+        空間的範囲に含まれる候補を選択する GeoContainsFilter を返す
+
+        フィルタの構築には GeoJSON の解析（URL の場合はダウンロード）と
+        セル分割表の作成が必要なので、最初に呼ばれたときに構築した
+        フィルタをこのコンテキストに保持し、 Workflow を作り直す際にも
+        使い回す。空間的範囲が設定されていない場合は None を返す。
+        """
+        if self._area_filter is None and self.target_area:
+            key = self.target_area
+            if not isinstance(key, (str, bytes)):
+                key = str(key)
+
+            area_filter = _area_filter_cache.get(key)
+            if area_filter is None:
+                # コンテキストは多数の記事の解析に使い回されるため、
+                # セル分割表を作成して判定を表引きにする
+                area_filter = GeoContainsFilter(
+                    self.target_area, grid_size=32)
+                _area_filter_cache[key] = area_filter
+
+            self._area_filter = area_filter
+
+        return self._area_filter
 
     def getPriority(self, node: Node) -> float:
         """
@@ -91,34 +188,90 @@ class Context(object):
             # 非地名語は常に優先度最低 = 0
             return 0.0
 
-        re_ne_class = re.compile(node.prop.get('ne_class'))
+        ne_class = node._ne_class
 
         # ノードが prefix, suffix を含むかどうかを判定
-        body_pos = node.surface.index(node.prop.get('body'))
-        has_prefix = body_pos > 0
-        has_suffix = (body_pos +
-                      len(node.prop.get('body'))) < len(node.surface)
+        # （表記の文字列検索を繰り返さないように、
+        # 判定結果はノードの _attr に保持しておく）
+        flags = node._attr.get('pfx_sfx')
+        if flags is None:
+            body = node.prop['body']
+            surface = node.surface
+            body_pos = surface.find(body)
+            flags = ((1 if body_pos > 0 else 0) |
+                     (2 if body_pos + len(body) < len(surface) else 0))
+            node._attr['pfx_sfx'] = flags
+        has_prefix = flags & 1 != 0
+        has_suffix = flags & 2 != 0
+
+        # 優先度は (ne_class, has_prefix, has_suffix) だけで決まるので、
+        # 同じ組み合わせに対する計算結果をキャッシュしておく
+        # （パスごとの評価で同じ地名語クラスが何度も現れるため）
+        key = (ne_class, has_prefix, has_suffix)
+        priority = self._cache.get(key)
+        if priority is not None:
+            return priority
+
+        priority = self._get_priority(ne_class, has_prefix, has_suffix)
+        self._cache[key] = priority
+        return priority
+
+    def getPriorityQ(self, node: Node) -> int:
+        """
+        getPriority と同じ優先度を 0〜1000 の固定小数点整数で返す
 
+        Python の整数は任意精度なので、整数のまま乗算を繰り返しても
+        浮動小数点のようにアンダーフローしない。
+        パスのスコア計算で利用する。
+        """
+        return int(self.getPriority(node) * 1000 + 0.5)
+
+    def _get_priority(self, ne_class: str,
+                      has_prefix: bool, has_suffix: bool) -> float:
+        """
+        固有名クラスと prefix / suffix の有無から優先度を計算する
+        （getPriority のキャッシュミス時に呼ばれる本体）
+        """
         if has_suffix:
             # suffix を含む場合の ne_class の優先度を取得
-            for ne_class, priority in self.priorities_with_suffix.items():
-                if re_ne_class.match(ne_class):
-                    return priority
+            priority = self._match_priority(
+                ne_class, self._priorities_with_suffix_compiled)
+            if priority is not None:
+                return priority
 
         if has_prefix:
             # prefix を含む場合の ne_class の優先度を取得
-            for ne_class, priority in self.priorities_with_prefix.items():
-                if re_ne_class.match(ne_class):
-                    return priority
+            priority = self._match_priority(
+                ne_class, self._priorities_with_prefix_compiled)
+            if priority is not None:
+                return priority
 
         # prefix, suffix を含まない場合の ne_class の優先度を取得
-        for ne_class, priority in self.priorities.items():
-            if re_ne_class.match(ne_class):
-                return priority
+        priority = self._match_priority(
+            ne_class, self._priorities_compiled)
+        if priority is not None:
+            return priority
 
         # 設定されていない場合は 0.5
         return 0.5
 
+    @staticmethod
+    def _match_priority(ne_class: str,
+                        compiled: tuple) -> Optional[float]:
+        """
+        コンパイル済みの優先度テーブルから固有名クラスに対応する
+        優先度を取得する。一致するキーがない場合は None を返す。
+        """
+        combined, values, group_nums = compiled
+        if combined is None:
+            return None
+
+        m = combined.match(ne_class)
+        if m:
+            return values[bisect_right(group_nums, m.lastindex) - 1]
+
+        return None
+
 
 class ContextFilter(Filter):
     """
@@ -152,14 +305,15 @@ class ContextFilter(Filter):
         Note
         ----
         コンテキスト情報が空間範囲を持っている場合、
-        範囲内の候補を選択するための GeoContainsFilter を作成し、
-        self._filter に保持します。
+        範囲内の候補を選択するための GeoContainsFilter を
+        コンテキストから取得し、 self._filter に保持します。
+        フィルタはコンテキスト側にキャッシュされるため、
+        Workflow を作り直しても再構築は行なわれません。
         """
         self.context = context
 
-        if self.context and self.context.target_area:
-            self._filter = GeoContainsFilter(
-                self.context.target_area)
+        if self.context:
+            self._filter = self.context.get_area_filter()
         else:
             self._filter = None
 
@@ -184,23 +338,20 @@ class ContextFilter(Filter):
         list[Node]
             条件に一致した候補ノードのリスト。
         """
-        if self._filter:
-            # 空間範囲が指定されていれば絞り込む
-            filtered_candidates = []
-            for candidate in candidates:
-                if self._filter.filter_func(candidate):
-                    filtered_candidates.append(candidate)
-        else:
-            filtered_candidates = candidates
+        # 先に安価な優先度の判定で候補を絞り込み、
+        # 空間判定は優先度を持つ候補に対してだけ行なう
+        getPriority = self.context.getPriority
+        results = [candidate for candidate in candidates
+                   if getPriority(node=candidate) > 0.0]
 
-        # 優先度がセットされている候補だけを含むリストを作成する
-        results = []
-        for candidate in filtered_candidates:
-            priority = self.context.getPriority(node=candidate)
-            if priority > 0.0:
-                results.append(candidate)
+        if self._filter is None or len(results) == 0:
+            return results
 
-        return results
+        # 空間範囲が指定されていれば一括判定で絞り込む
+        # （filter_batch は GEOS の呼び出しを1回にまとめる）
+        results_mask = self._filter.filter_batch(results)
+        return [candidate for candidate, ok
+                in zip(results, results_mask) if ok]
 
 
 class ContextScoringClass(ScoringClass):
@@ -220,16 +371,29 @@ class ContextScoringClass(ScoringClass):
         """
         デフォルト実装のスコアにコンテキスト情報の
         優先度を乗算します。
+
+        優先度 0 の地名語を含むパスのスコアは必ず 0 になるため、
+        先に優先度だけを調べ、デフォルト実装のスコア計算を
+        省略します。
         """
-        score = super().path_score(path)
+        # 優先度は 0〜1000 の固定小数点整数として乗算する
+        # （任意精度の整数なので長いパスでもアンダーフローしない）
+        getPriorityQ = self.context.getPriorityQ
+        numerator = 1
+        n_geowords = 0
+        for geoword in Evaluator.iter_geowords(path):
+            q = getPriorityQ(geoword)
+            if q == 0:
+                return 0.0
+
+            numerator *= q
+            n_geowords += 1
 
-        geowords = Evaluator.collect_geowords(path)
-        for geoword in geowords:
-            score *= self.context.getPriority(geoword)
-            if score == 0.0:
-                break
+        score = super().path_score(path)
+        if score <= 0.0 or n_geowords == 0:
+            return score
 
-        return score
+        return score * (numerator / 1000 ** n_geowords)
 
 
 class ContextEvaluator(Evaluator):
@@ -237,10 +401,51 @@ class ContextEvaluator(Evaluator):
     コンテキスト情報を利用して最適な候補を返す Evaluator
     """
 
-    def __init__(self, context: Context, max_results: int = 5):
+    def __init__(self, context: Context, max_results: int = 5,
+                 n_workers: Optional[int] = None):
+        """
+        Parameters
+        ----------
+        context: Context
+            利用するコンテキスト情報
+        max_results: int
+            保持する結果の最大数
+        n_workers: int, optional
+            パスのスコアリングを並列に行なうスレッド数。
+            スコア計算の大部分は純 Python の処理で GIL の制約を
+            受けるため、デフォルトでは逐次処理します。
+            正規表現照合やジオメトリ演算の比率が高い場合のみ
+            指定してください。
+        """
         super().__init__(
             scoring_class=ContextScoringClass(context),
             max_results=max_results)
+        self.n_workers = n_workers
+
+    def get(self, lattice):
+        """
+        Evaluator.get() をオーバーライドし、 n_workers が
+        指定されている場合はパスのスコアリングを
+        スレッドプールで並列に行ないます。
+        """
+        if not self.n_workers:
+            return super().get(lattice)
+
+        combination = self.count_combinations(lattice)
+        if combination > self.max_combinations:
+            raise LinkerError(
+                "組み合わせ数 {} がしきい値 {} を超えています。".format(
+                    combination, self.max_combinations))
+
+        paths = list(LinkedResults(lattice))
+        with ThreadPoolExecutor(max_workers=self.n_workers) as executor:
+            scores = executor.map(self.scorer.path_score, paths)
+
+        results = [{"score": score, "result": path}
+                   for score, path in zip(scores, paths)]
+        # 同点のパスは列挙した順を保つ（安定ソート）
+        results.sort(key=lambda r: r['score'], reverse=True)
+        return results[0:self.max_results]
 
 
 class ContextWorkflow(Workflow):
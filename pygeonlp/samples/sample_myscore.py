@@ -31,18 +31,18 @@ class MyScoringClass(ScoringClass):
         int
             target_class にマッチする固有名クラスを持つ地名語数。
         """
-        if not isinstance(self.options, str):
-            raise RuntimeError(
-                "オプションパラメータは文字列で指定してください。")
-
-        target_class = self.options
-        score = 0
-        geowords = Evaluator.collect_geowords(path)
-        for geoword in geowords:
-            if geoword.prop['ne_class'].startswith(target_class):
-                score += 1
-
-        return score
+        target_class = getattr(self, '_target_class', None)
+        if target_class is None:
+            # オプションの検証は最初の呼び出しで一度だけ行なう
+            if not isinstance(self.options, str):
+                raise RuntimeError(
+                    "オプションパラメータは文字列で指定してください。")
+
+            target_class = self._target_class = self.options
+
+        return sum(
+            1 for geoword in Evaluator.iter_geowords(path)
+            if geoword._ne_class.startswith(target_class))
 
 
 if __name__ == '__main__':
@@ -15,16 +15,26 @@ python -m unittest -v pygeonlp.tests.test_api
 """
 
 
+# テストデータベースのディレクトリ
+# pytest-xdist で並列実行する場合はワーカーごとに別ディレクトリを使う
+TESTDIR = os.path.abspath(os.path.join(
+    os.getcwd(),
+    'apitest' + os.environ.get('PYTEST_XDIST_WORKER', '')))
+
+
 class TestModuleMethods(unittest.TestCase):
 
-    service = api.service.Service()
+    @classmethod
+    def setUpClass(cls):
+        # データベースの作成は時間がかかるためクラスごとに一度だけ行なう
+        os.makedirs(TESTDIR, 0o755, exist_ok=True)
+        cls.dictmanager = api.dict_manager.DictManager(db_dir=TESTDIR)
+        cls.dictmanager.setupBasicDatabase()
+        api.init(db_dir=TESTDIR)
 
-    def setUp(self):
-        testdir = os.path.abspath(os.path.join(os.getcwd(), 'apitest'))
-        os.makedirs(testdir, 0o755, exist_ok=True)
-        self.dictmanager = api.dict_manager.DictManager(db_dir=testdir)
-        self.dictmanager.setupBasicDatabase()
-        api.init(db_dir=testdir)
+        # Service の作成もクラスごとに一度だけ行なう
+        # （データベース作成後に作成する必要がある）
+        cls.service = api.service.Service(db_dir=TESTDIR)
 
     def test_search_word(self):
         words = self.service.searchWord('神保町')
@@ -64,11 +74,18 @@ class TestModuleMethods(unittest.TestCase):
         self.assertIsInstance(words, dict)
         self.assertIn('AGGwyc', words)  # 新宿線神保町駅
 
+    @staticmethod
+    def _load_fixture(filename):
+        # ネットワークからのダウンロードを避けるため、
+        # 簡略化した市域の GeoJSON をローカルのファイルから読み込む
+        path = os.path.join(
+            os.path.dirname(__file__), 'fixtures', filename)
+        with open(path, encoding='utf-8') as f:
+            return f.read()
+
     def test_geo_contains_filter(self):
-        from pygeonlp.api.spatial_filter import SpatialFilter, GeoContainsFilter
-        geojson = SpatialFilter.get_geometry((
-            'https://geoshape.ex.nii.ac.jp/city/geojson/'
-            '20230101/13/13206A1968.geojson')).ExportToJson()
+        from pygeonlp.api.spatial_filter import GeoContainsFilter
+        geojson = self._load_fixture('fuchu_tokyo.geojson')
         gcfilter = GeoContainsFilter(geojson)
         api.default_workflow().filters = [gcfilter]
         result = api.geoparse('府中に行きます')
@@ -76,10 +93,8 @@ class TestModuleMethods(unittest.TestCase):
         api.default_workflow().filters = []
 
     def test_geo_disjoint_filter(self):
-        from pygeonlp.api.spatial_filter import SpatialFilter, GeoDisjointFilter
-        geojson = SpatialFilter.get_geometry((
-            'https://geoshape.ex.nii.ac.jp/city/geojson/'
-            '20200101/13/13208A1968.geojson')).ExportToJson()
+        from pygeonlp.api.spatial_filter import GeoDisjointFilter
+        geojson = self._load_fixture('chofu_tokyo.geojson')
         gcfilter = GeoDisjointFilter(geojson)
         api.default_workflow().filters = [gcfilter]
         result = api.geoparse('府中に行きます')
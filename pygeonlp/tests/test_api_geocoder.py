@@ -22,6 +22,51 @@ python -m unittest -v pygeonlp.tests.test_api_geocoder
 # os.environ["JAGEOCODER_SERVER_URL"] = "https://jageocoder.info-proto.com/jsonrpc"
 # os.environ["JAGEOCODER_DB2_DIR"] = "/home/user/jageocoder/db2"
 
+# テストデータベースのディレクトリ
+# pytest-xdist で並列実行する場合はワーカーごとに別ディレクトリを使う
+TESTDIR = os.path.abspath(os.path.join(
+    os.getcwd(),
+    'apitest' + os.environ.get('PYTEST_XDIST_WORKER', '')))
+
+# 期待される形態素表記列（テストごとに再生成しないよう定数化）
+ANSWER_CHIYODA_HITOTSUBASHI = ('千代田区', '一ツ橋', '2', '-', '1', '-')
+ANSWER_YOKOHAMA_TERAYAMA = ('横浜市', '緑区', '寺山', '町', '118', '番地')
+ANSWER_HAMAMATSU_MISAKUBO = ('静岡県', '浜松市', '天竜区', '水窪町', '山住')
+
+# テストデータベースと Workflow はオープンに時間がかかるため、
+# 一度作成したものをモジュール内で共有する
+_shared = {}
+
+
+def _get_shared_workflow():
+    """
+    テストデータベースを作成し、 jageocoder を利用する Workflow を
+    作成して返します。最初の呼び出しで作成した Workflow を記憶し、
+    以降の呼び出しではデータベースを開き直さずに同じものを返します。
+    住所辞書がインストールされていない場合は None を返します。
+    """
+    if 'workflow' in _shared:
+        return _shared['workflow']
+
+    # Create test database
+    os.environ['GEONLP_DB_DIR'] = TESTDIR
+    os.makedirs(TESTDIR, 0o755, exist_ok=True)
+    dict_manager = api.dict_manager.DictManager(db_dir=TESTDIR)
+    dict_manager.setupBasicDatabase()
+
+    # Initialize jageocoder
+    try:
+        jageocoder.init()
+        workflow = Workflow(
+            db_dir=TESTDIR,
+            jageocoder=jageocoder.get_module_tree(),
+        )
+    except jageocoder.exceptions.JageocoderError:
+        workflow = None
+
+    _shared['workflow'] = workflow
+    return workflow
+
 
 class TestModuleMethods(unittest.TestCase):
 
@@ -29,23 +74,9 @@ class TestModuleMethods(unittest.TestCase):
 
     @classmethod
     def setUpClass(cls):
-        # Create test database
-        testdir = os.path.abspath(os.path.join(os.getcwd(), 'apitest'))
-        os.environ['GEONLP_DB_DIR'] = testdir
-        os.makedirs(testdir, 0o755, exist_ok=True)
-        dict_manager = api.dict_manager.DictManager(db_dir=testdir)
-        dict_manager.setupBasicDatabase()
-
-        # Initialize jageocoder
-        try:
-            jageocoder.init()
-            cls.workflow = Workflow(
-                db_dir=testdir,
-                jageocoder=jageocoder.get_module_tree(),
-            )
+        cls.workflow = _get_shared_workflow()
+        if cls.workflow is not None:
             cls.parser = cls.workflow.parser
-        except jageocoder.exceptions.JageocoderError:
-            cls.workflow = None
 
     def setUp(self):
         if self.workflow is None:
@@ -64,12 +95,10 @@ class TestModuleMethods(unittest.TestCase):
         self.assertEqual(lattice_address[0][0].surface, '千代田区一ツ橋2-1-')
 
         # 内部の形態素を確認
-        answer = ['千代田区', '一ツ橋', '2', '-', '1', '-']
         inner_morphemes = lattice_address[0][0].morphemes
-        self.assertEqual(len(inner_morphemes), len(answer))
-        for i, node in enumerate(inner_morphemes):
-            self.assertIsInstance(node, Node)
-            self.assertEqual(node.surface, answer[i])
+        self.assertTrue(all(isinstance(n, Node) for n in inner_morphemes))
+        self.assertEqual(tuple(n.surface for n in inner_morphemes),
+                         ANSWER_CHIYODA_HITOTSUBASHI)
 
     def test_geoparse_with_address_no_cutoff(self):
         """
@@ -97,12 +126,10 @@ class TestModuleMethods(unittest.TestCase):
 
         # 内部の形態素を確認
         # 「寺山町」が MeCab の結果通り、住所要素の区切りと一致しない
-        answer = ['横浜市', '緑区', '寺山', '町', '118', '番地']
         inner_morphemes = lattice_address[0][0].morphemes
-        self.assertEqual(len(inner_morphemes), len(answer))
-        for i, node in enumerate(inner_morphemes):
-            self.assertIsInstance(node, Node)
-            self.assertEqual(node.surface, answer[i])
+        self.assertTrue(all(isinstance(n, Node) for n in inner_morphemes))
+        self.assertEqual(tuple(n.surface for n in inner_morphemes),
+                         ANSWER_YOKOHAMA_TERAYAMA)
 
         # '緑区' が '横浜市緑区' に解決されていることを確認
         midoriku = inner_morphemes[1]
@@ -154,12 +181,10 @@ class TestModuleMethods(unittest.TestCase):
         lattice_address = self.parser.add_address_candidates(lattice)
 
         # 内部の形態素を確認
-        answer = ['静岡県', '浜松市', '天竜区', '水窪町', '山住']
         inner_morphemes = lattice_address[0][0].morphemes
-        self.assertEqual(len(inner_morphemes), len(answer))
         self.assertEqual(inner_morphemes[0].node_type, Node.GEOWORD)
         self.assertEqual(inner_morphemes[1].node_type, Node.GEOWORD)
         self.assertEqual(inner_morphemes[2].node_type, Node.GEOWORD)
-        for i, node in enumerate(inner_morphemes):
-            self.assertIsInstance(node, Node)
-            self.assertEqual(node.surface, answer[i])
+        self.assertTrue(all(isinstance(n, Node) for n in inner_morphemes))
+        self.assertEqual(tuple(n.surface for n in inner_morphemes),
+                         ANSWER_HAMAMATSU_MISAKUBO)
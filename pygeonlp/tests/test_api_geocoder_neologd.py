@@ -26,6 +26,16 @@ python -m unittest -v pygeonlp.tests.test_api_geocoder_neologd
 os.environ["NEOLOGD_DIC_DIR"] = os.path.join(
     os.environ.get("HOME"), "neologd/")
 
+# テストデータベースのディレクトリ
+# pytest-xdist で並列実行する場合はワーカーごとに別ディレクトリを使う
+TESTDIR = os.path.abspath(os.path.join(
+    os.getcwd(),
+    'apitest' + os.environ.get('PYTEST_XDIST_WORKER', '')))
+
+# 期待される形態素表記列（テストごとに再生成しないよう定数化）
+ANSWER_CHIYODA_HITOTSUBASHI = ('千代田区一ツ橋', '2', '-1')
+ANSWER_YOKOHAMA_TERAYAMA = ('横浜市緑区寺山町', '118番', '地')
+
 
 class TestModuleMethods(unittest.TestCase):
 
@@ -36,25 +46,29 @@ class TestModuleMethods(unittest.TestCase):
         if cls.neologd_dic_dir is None:
             return
 
-        # Create test database
-        testdir = os.path.abspath(os.path.join(os.getcwd(), 'apitest'))
-        os.environ['GEONLP_DB_DIR'] = testdir
-        os.makedirs(testdir, 0o755, exist_ok=True)
-        dict_manager = api.dict_manager.DictManager(db_dir=testdir)
-        dict_manager.setupBasicDatabase()
-        api.init()
-
         # Initialize jageocoder
+        # 住所辞書がなければ全テストがスキップされるため、
+        # テストデータベースを作成する前に確認する
         try:
             jageocoder.init()
-            cls.workflow = Workflow(
-                db_dir=testdir,
-                system_dic_dir=cls.neologd_dic_dir,
-                jageocoder=jageocoder.get_module_tree(),
-            )
-            cls.parser = cls.workflow.parser
+            jageocoder_tree = jageocoder.get_module_tree()
         except jageocoder.exceptions.JageocoderError:
             cls.workflow = None
+            return
+
+        # Create test database
+        os.environ['GEONLP_DB_DIR'] = TESTDIR
+        os.makedirs(TESTDIR, 0o755, exist_ok=True)
+        dict_manager = api.dict_manager.DictManager(db_dir=TESTDIR)
+        dict_manager.setupBasicDatabase()
+        api.init()
+
+        cls.workflow = Workflow(
+            db_dir=TESTDIR,
+            system_dic_dir=cls.neologd_dic_dir,
+            jageocoder=jageocoder_tree,
+        )
+        cls.parser = cls.workflow.parser
 
     def setUp(self):
         if self.neologd_dic_dir is None:
@@ -77,12 +91,10 @@ class TestModuleMethods(unittest.TestCase):
         self.assertEqual(lattice_address[0][0].surface, '千代田区一ツ橋2-1')
 
         # 内部の形態素を確認
-        answer = ['千代田区一ツ橋', '2', '-1']
         inner_morphemes = lattice_address[0][0].morphemes
-        self.assertEqual(len(inner_morphemes), len(answer))
-        for i, node in enumerate(inner_morphemes):
-            self.assertIsInstance(node, Node)
-            self.assertEqual(node.surface, answer[i])
+        self.assertTrue(all(isinstance(n, Node) for n in inner_morphemes))
+        self.assertEqual(tuple(n.surface for n in inner_morphemes),
+                         ANSWER_CHIYODA_HITOTSUBASHI)
 
     def test_geoparse_with_address_no_cutoff(self):
         """
@@ -109,12 +121,10 @@ class TestModuleMethods(unittest.TestCase):
         self.assertEqual(lattice_address[0][0].surface, '横浜市緑区寺山町118番地')
 
         # 内部の形態素を確認
-        answer = ['横浜市緑区寺山町', '118番', '地']
         inner_morphemes = lattice_address[0][0].morphemes
-        self.assertEqual(len(inner_morphemes), len(answer))
-        for i, node in enumerate(inner_morphemes):
-            self.assertIsInstance(node, Node)
-            self.assertEqual(node.surface, answer[i])
+        self.assertTrue(all(isinstance(n, Node) for n in inner_morphemes))
+        self.assertEqual(tuple(n.surface for n in inner_morphemes),
+                         ANSWER_YOKOHAMA_TERAYAMA)
 
     def test_geoparse_location_disambiguation_hyponym(self):
         """
@@ -21,7 +21,13 @@ def get_testdir():
     return os.path.abspath(os.path.join(os.getcwd(), 'apitest'))
 
 
-def setup(test):
+def bootstrap():
+    """
+    テストデータベースを作成します。
+    データベースの作成は時間がかかるため、モジュールごとの
+    DocTestSuite の setUp ではなく、 load_tests() から
+    一度だけ呼びだします。
+    """
     testdir = get_testdir()
     os.environ['GEONLP_DB_DIR'] = testdir
     os.makedirs(testdir, 0o755, exist_ok=True)
@@ -47,8 +53,15 @@ def setup(test):
     api.init(db_dir=testdir)
 
 
+def setup(test):
+    # doctest が変更した解析条件（アクティブな辞書・クラスなど）を
+    # 次の DocTestSuite に持ち越さないよう再初期化だけ行なう
+    api.init(db_dir=get_testdir())
+
+
 def load_tests(loader, tests, ignore):
     shutil.rmtree(get_testdir(), ignore_errors=True)
+    bootstrap()
 
     from pygeonlp.api import devtool, temporal_filter
     modules = [
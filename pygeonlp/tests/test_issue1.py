@@ -1,5 +1,26 @@
+import time
+import unittest
+
 import pygeonlp.api
 
-pygeonlp.api.init()
-results = pygeonlp.api.geoparse("第二希望：東京、静岡、三重、滋賀、大阪")
-print(results)
+
+class TestIssue1(unittest.TestCase):
+    """
+    Issue #1 の回帰テスト。
+
+    地名語を多く含む文を geoparse() すると RecursionError が
+    発生することがあった。
+    """
+
+    def test_geoparse_many_geowords(self):
+        pygeonlp.api.init()
+        t0 = time.monotonic()
+        results = pygeonlp.api.geoparse("第二希望：東京、静岡、三重、滋賀、大阪")
+        elapsed = time.monotonic() - t0
+        self.assertGreater(len(results), 0)
+        # 処理時間が極端に悪化していないことも確認する
+        self.assertLess(elapsed, 10.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,5 @@
 import logging
-from multiprocessing import Process
-import time
+import multiprocessing
 import unittest
 
 from pygeonlp.api.node import Node
@@ -17,12 +16,24 @@ logger = logging.getLogger(__name__)
 python -m unittest -v pygeonlp.tests.test_multiprocess
 """
 
+# ワーカープロセスごとに一度だけ作成する Parser
+_parser = None
 
-def analyze(query):
+
+def _init_parser():
+    """
+    ワーカープロセスの初期化処理。
+    辞書のオープンに時間がかかるため、 Parser はプロセスごとに
+    一度だけ作成し、以後のクエリで使い回す。
+    """
+    global _parser
     service = api.service.Service()
-    parser = api.parser.Parser(service=service)
-    while True:
-        parser.analyze_sentence(query)
+    _parser = api.parser.Parser(service=service)
+
+
+def analyze(query, iters):
+    for _ in range(iters):
+        _parser.analyze_sentence(query)
 
 
 class TestMultiProcessing(unittest.TestCase):
@@ -72,17 +83,15 @@ class TestMultiProcessing(unittest.TestCase):
         """
         Test simultaneous analyzes in multi-processes.
         """
-
-        processes = []
-        for q in self.__class__.queries:
-            p = Process(target=analyze, args=(q, ))
-            p.start()
-            processes.append(p)
-
-        time.sleep(10)
-
-        for p in processes:
-            p.terminate()
+        queries = self.__class__.queries
+        # Parser は initializer でワーカープロセスごとに一度だけ
+        # 作成し、以後のクエリで使い回す。
+        # fork コンテキストを利用するのは、spawn よりプロセスの
+        # 起動とモジュールの再インポートが軽いため。
+        ctx = multiprocessing.get_context('fork')
+        with ctx.Pool(processes=len(queries),
+                      initializer=_init_parser) as pool:
+            pool.starmap(analyze, [(q, 50) for q in queries])
 
 
 if __name__ == '__main__':
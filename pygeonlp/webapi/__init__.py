@@ -1,5 +1,6 @@
 import logging
 import os
+import threading
 
 import jageocoder
 import pygeonlp.api as geonlp_api
@@ -16,12 +17,6 @@ class BaseConfig(object):
     if MECAB_DIC_DIR is not None:
         GEONLP_API_OPTIONS['system_dic_dir'] = MECAB_DIC_DIR
 
-    try:
-        jageocoder.init()
-        JAGEOCODER_TREE = jageocoder.get_module_tree()
-    except jageocoder.exceptions.JageocoderError:
-        JAGEOCODER_TREE = None
-
     LOGGING = {
         'version': 1,
         'formatters': {'default': {
@@ -52,3 +47,30 @@ class TestingConfig(BaseConfig):
 
 
 config = DevelopmentConfig()
+
+# 住所辞書 (jageocoder) の初期化状態
+# False は未初期化、None は利用できないことを表す
+_jageocoder_tree = False
+_jageocoder_lock = threading.Lock()
+
+
+def jageocoder_tree():
+    """
+    住所辞書 (jageocoder) を初期化して AddressTree を返します。
+    住所辞書が利用できない場合は None を返します。
+
+    住所辞書のオープンには時間とメモリが必要なため、
+    モジュールのインポート時ではなく、住所ジオコーディングが
+    最初に必要になった時点で一度だけ初期化します。
+    """
+    global _jageocoder_tree
+    if _jageocoder_tree is False:
+        with _jageocoder_lock:
+            if _jageocoder_tree is False:
+                try:
+                    jageocoder.init()
+                    _jageocoder_tree = jageocoder.get_module_tree()
+                except jageocoder.exceptions.JageocoderError:
+                    _jageocoder_tree = None
+
+    return _jageocoder_tree
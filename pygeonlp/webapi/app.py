@@ -1,6 +1,11 @@
 from collections.abc import Iterable
+import copy
 import datetime
+from functools import lru_cache
+import json
 from logging.config import dictConfig
+import threading
+import types
 from typing import List, Union, Optional
 
 from flask import Flask, redirect
@@ -9,24 +14,110 @@ from flask_jsonrpc.exceptions import MethodNotFoundError, InvalidParamsError
 
 import jageocoder
 import pygeonlp.api as geonlp_api
-from pygeonlp.webapi import config
+from pygeonlp.api.filter import FilterError
+from pygeonlp.api import temporal_filter
+from pygeonlp.api.workflow import Workflow
+from pygeonlp.webapi import config, jageocoder_tree
+
+try:
+    from pygeonlp.api.spatial_filter import (
+        GeoContainsFilter, GeoDisjointFilter)
+except FilterError:
+    # GDAL がインストールされていない場合、
+    # geo-contains / geo-disjoint オプションは利用できない
+    GeoContainsFilter = None
+    GeoDisjointFilter = None
 
 dictConfig(config.LOGGING)
 app = Flask('pygeonlp_webapi')
 app.config.from_object(config)
+
+try:
+    # orjson がインストールされていれば JSON のシリアライズに利用する
+    # parse / parseStructured の大きな FeatureCollection 応答の
+    # 作成が大幅に高速になる
+    import orjson
+    from flask.json.provider import JSONProvider
+
+    class OrjsonProvider(JSONProvider):
+        """
+        orjson を利用する Flask の JSON プロバイダ。
+        """
+
+        def dumps(self, obj, **kwargs):
+            return orjson.dumps(obj).decode('utf-8')
+
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+
+    app.json = OrjsonProvider(app)
+except ImportError:
+    pass
+
 jsonrpc = JSONRPC(app, '/api', enable_web_browsable_api=True)
 
+# 辞書を指定するオプションキーと対応する Workflow メソッド名・説明
+_DIC_OPTIONS = {
+    'set-dic': ('setActiveDictionaries', '利用する'),
+    'remove-dic': ('disactivateDictionaries', '除外する'),
+    'add-dic': ('activateDictionaries', '追加する'),
+}
+
+# 'geocoding' オプションで真とみなす値
+_GEOCODING_TRUE = frozenset((True, 'true', 'True'))
+
+# options が省略された場合に利用する変更不可の空マッピング
+_EMPTY_OPTIONS = types.MappingProxyType({})
+
+# スレッドごとの Workflow と、最後に適用した解析条件の
+# フィンガープリントを保持する
+_tls = threading.local()
+
+
+def _get_workflow():
+    """
+    リクエストを処理するスレッド専用の Workflow を返します。
+
+    Flask がマルチスレッドで動作する場合、プロセス全体で共有する
+    Workflow に対して set_jageocoder() や filters、アクティブな
+    辞書・クラスの変更を行なうと、並行するリクエスト間で
+    解析条件が競合します。
+    これを避けるため、Workflow はスレッドごとに一度だけ作成して
+    使い回します。
+    """
+    workflow = getattr(_tls, 'workflow', None)
+    if workflow is None:
+        # テストなどで pygeonlp.api.init() に別の db_dir が
+        # 渡されている場合はそのデータベースを利用する
+        default_workflow = geonlp_api.default_workflow()
+        if default_workflow is not None:
+            db_dir = default_workflow.parser.service.db_dir
+        else:
+            db_dir = config.GEONLP_DIR
+
+        workflow = Workflow(
+            db_dir=db_dir, **(config.GEONLP_API_OPTIONS))
+        _tls.workflow = workflow
+        _tls.last_applied_sig = None
+
+    return workflow
+
 
 def apply_geonlp_api_parse_options(options: Optional[dict] = None):
     """
     Parse, ParseStructured のオプションに含まれる解析条件を
-    geonlp_api に適用します。
+    このスレッドの Workflow に適用します。
 
     Parameters
     ----------
     options: dict, optional
         Parse オプション
 
+    Returns
+    -------
+    Workflow
+        解析条件を適用したこのスレッドの Workflow。
+
     Notes
     -----
     利用可能なオプションは以下の通りで、この順番に処理されます。
@@ -86,55 +177,46 @@ def apply_geonlp_api_parse_options(options: Optional[dict] = None):
         TimeCoversFilter の基準日時を表す文字列、
         または期間の開始日時と終了日時を表す2つの文字列。
     """
-    if options is None:
-        options = {}
+    options = options or _EMPTY_OPTIONS
 
     if geonlp_api.default_workflow() is None:
         # 最初のメソッド呼び出しの前に明示的に pygeonlp.api.init() が
         # 呼ばれていない場合、ここで初期化します。
+        # （getDictionaries などモジュールレベル API が利用します）
         geonlp_api.init(db_dir=config.GEONLP_DIR,
                         **(config.GEONLP_API_OPTIONS))
 
-    geonlp_api.setActiveDictionaries(pattern=r'.*')  # デフォルトに戻す
+    workflow = _get_workflow()
 
-    if 'set-dic' in options:
-        param = options.get('set-dic')
-        if isinstance(param, str):
-            geonlp_api.setActiveDictionaries(pattern=param)
-        elif isinstance(param, Iterable):
-            geonlp_api.setActiveDictionaries(idlist=param)
-        else:
-            raise TypeError((
-                "'set-dic' には利用する辞書の id か identifier のリスト、"
-                "または identifer の正規表現文字列を指定してください。"))
+    # このスレッドで直前に適用した解析条件と同じなら再適用を省略する
+    sig = json.dumps(options, sort_keys=True, default=str) \
+        if options else ''
+    if sig == _tls.last_applied_sig:
+        return workflow
 
-    if 'remove-dic' in options:
-        param = options.get('remove-dic')
-        if isinstance(param, str):
-            geonlp_api.disactivateDictionaries(pattern=param)
-        elif isinstance(param, Iterable):
-            geonlp_api.disactivateDictionaries(idlist=param)
-        else:
-            raise TypeError((
-                "'remove-dic' には除外する辞書の id か identifier のリスト、"
-                "または identifer の正規表現文字列を指定してください。"))
+    workflow.setActiveDictionaries(pattern=r'.*')  # デフォルトに戻す
 
-    if 'add-dic' in options:
-        param = options.get('add-dic')
+    for key, (method, verb) in _DIC_OPTIONS.items():
+        if key not in options:
+            continue
+
+        func = getattr(workflow, method)
+        param = options.get(key)
         if isinstance(param, str):
-            geonlp_api.activateDictionaries(pattern=param)
+            func(pattern=param)
         elif isinstance(param, Iterable):
-            geonlp_api.activateDictionaries(idlist=param)
+            func(idlist=param)
         else:
             raise TypeError((
-                "'add-dic' には追加する辞書の id か identifier のリスト、"
-                "または identifer の正規表現文字列を指定してください。"))
+                "'{}' には{}辞書の id か identifier のリスト、"
+                "または identifer の正規表現文字列を指定してください。"
+            ).format(key, verb))
 
     active_classes = []
     if 'set-class' in options:
         param = options.get('set-class')
         if isinstance(param, Iterable):
-            active_classes = [str(x) for x in list(param)]
+            active_classes = [str(x) for x in param]
         else:
             raise TypeError((
                 "'set-class' には解析対象とする固有名クラスを"
@@ -143,7 +225,7 @@ def apply_geonlp_api_parse_options(options: Optional[dict] = None):
     if 'remove-class' in options:
         param = options.get('remove-class')
         if isinstance(param, Iterable):
-            for x in list(param):
+            for x in param:
                 if str(x)[0] == '-':
                     active_classes.append(str(x)[1:])
                 else:
@@ -157,110 +239,119 @@ def apply_geonlp_api_parse_options(options: Optional[dict] = None):
     if 'add-class' in options:
         param = options.get('add-class')
         if isinstance(param, Iterable):
-            active_classes += [str(x) for x in list(param)]
+            active_classes += [str(x) for x in param]
         else:
             raise TypeError((
                 "'add-class' には解析対象に追加する固有名クラスを"
                 "正規表現のリストで指定してください。"))
 
-    geonlp_api.setActiveClasses(active_classes)
+    workflow.setActiveClasses(active_classes)
+    _tls.last_applied_sig = sig
+
+    return workflow
 
 
-def get_filters_from_options(options: Optional[dict] = {}):
+# フィルタを指定するオプションキーと temporal_filter のクラス名
+_TEMPORAL_FILTERS = {
+    'time-exists': 'TimeExistsFilter',
+    'time-before': 'TimeBeforeFilter',
+    'time-after': 'TimeAfterFilter',
+    'time-overlaps': 'TimeOverlapsFilter',
+    'time-covers': 'TimeCoversFilter',
+}
+
+_FILTER_OPTION_KEYS = (
+    'geo-contains', 'geo-disjoint',
+) + tuple(_TEMPORAL_FILTERS.keys())
+
+
+def _freeze_param(param):
     """
-    Parse, ParseStructured のオプションに含まれる
-    フィルタのリストを解析し、フィルタオブジェクトを作成して返す。
+    フィルタのパラメータを ``_build_filter()`` の lru_cache の
+    キーとして利用できるハッシュ可能な値に変換します。
+
+    Returns
+    -------
+    tuple
+        (変換後のパラメータ, JSON 文字列に変換したかどうか) の tuple。
     """
-    filters = []
+    if isinstance(param, (dict, list)):
+        return (json.dumps(
+            param, sort_keys=True, ensure_ascii=False), True)
 
-    if 'geo-contains' in options:
-        param = options.get('geo-contains')
-        if isinstance(param, str):
-            geojson = param
-        elif isinstance(param, dict) and 'geometry' in param:
-            geojson = param['geometry']
-        else:
-            geojson = param
+    return (param, False)
 
-        from pygeonlp.api.spatial_filter import GeoContainsFilter
-        filters.append(GeoContainsFilter(geojson))
 
-    if 'geo-disjoint' in options:
-        param = options.get('geo-disjoint')
-        if isinstance(param, str):
-            geojson = param
-        elif isinstance(param, dict) and 'geometry' in param:
+def _build_filter(kind, param_repr, is_json):
+    """
+    オプションのキーとパラメータからフィルタオブジェクトを
+    スレッドごとのキャッシュ経由で作成します。
+
+    GeoJSON の取得・解析やフィルタの初期化にはコストがかかるため、
+    同じ条件で作成したフィルタオブジェクトはキャッシュして
+    リクエスト間で再利用します。ただし SpatialFilter は判定時に
+    内部のジオメトリを書き換えるため、スレッド間で共有すると
+    判定結果が壊れます。キャッシュは Workflow と同様に
+    スレッドローカルに保持します。
+    """
+    cached = getattr(_tls, 'build_filter_cached', None)
+    if cached is None:
+        cached = lru_cache(maxsize=128)(_create_filter)
+        _tls.build_filter_cached = cached
+
+    return cached(kind, param_repr, is_json)
+
+
+def _create_filter(kind, param_repr, is_json):
+    """
+    オプションのキーとパラメータからフィルタオブジェクトを作成します。
+    """
+    param = json.loads(param_repr) if is_json else param_repr
+
+    if kind in ('geo-contains', 'geo-disjoint'):
+        if GeoContainsFilter is None:
+            raise FilterError((
+                "SpatialFilter を利用するには 'gdal' パッケージを"
+                "インストールしてください。"))
+
+        if isinstance(param, dict) and 'geometry' in param:
             geojson = param['geometry']
         else:
             geojson = param
 
-        from pygeonlp.api.spatial_filter import GeoDisjointFilter
-        filters.append(GeoDisjointFilter(geojson))
-
-    if 'time-exists' in options:
-        param = options.get('time-exists')
-        from pygeonlp.api.temporal_filter import TimeExistsFilter
-        if isinstance(param, (str, datetime.date, datetime.datetime)):
-            filters.append(TimeExistsFilter(param))
-        elif isinstance(param, (list, tuple)):
-            filters.append(TimeExistsFilter(*param))
-        elif isinstance(param, dict):
-            filters.append(TimeExistsFilter(**param))
-        else:
-            raise TypeError(
-                "'time-exists' のパラメータが解析できません")
-
-    if 'time-before' in options:
-        param = options.get('time-before')
-        from pygeonlp.api.temporal_filter import TimeBeforeFilter
-        if isinstance(param, (str, datetime.date, datetime.datetime)):
-            filters.append(TimeBeforeFilter(param))
-        elif isinstance(param, (list, tuple)):
-            filters.append(TimeBeforeFilter(*param))
-        elif isinstance(param, dict):
-            filters.append(TimeBeforeFilter(**param))
-        else:
-            raise TypeError(
-                "'time-before' のパラメータが解析できません")
-
-    if 'time-after' in options:
-        param = options.get('time-after')
-        from pygeonlp.api.temporal_filter import TimeAfterFilter
-        if isinstance(param, (str, datetime.date, datetime.datetime)):
-            filters.append(TimeAfterFilter(param))
-        elif isinstance(param, (list, tuple)):
-            filters.append(TimeAfterFilter(*param))
-        elif isinstance(param, dict):
-            filters.append(TimeAfterFilter(**param))
-        else:
-            raise TypeError(
-                "'time-after' のパラメータが解析できません")
-
-    if 'time-overlaps' in options:
-        param = options.get('time-overlaps')
-        from pygeonlp.api.temporal_filter import TimeOverlapsFilter
-        if isinstance(param, (str, datetime.date, datetime.datetime)):
-            filters.append(TimeOverlapsFilter(param))
-        elif isinstance(param, (list, tuple)):
-            filters.append(TimeOverlapsFilter(*param))
-        elif isinstance(param, dict):
-            filters.append(TimeOverlapsFilter(**param))
-        else:
-            raise TypeError(
-                "'time-overlaps' のパラメータが解析できません")
-
-    if 'time-covers' in options:
-        param = options.get('time-covers')
-        from pygeonlp.api.temporal_filter import TimeCoversFilter
-        if isinstance(param, (str, datetime.date, datetime.datetime)):
-            filters.append(TimeCoversFilter(param))
-        elif isinstance(param, (list, tuple)):
-            filters.append(TimeCoversFilter(*param))
-        elif isinstance(param, dict):
-            filters.append(TimeCoversFilter(**param))
-        else:
-            raise TypeError(
-                "'time-covers' のパラメータが解析できません")
+        if kind == 'geo-contains':
+            return GeoContainsFilter(geojson)
+
+        return GeoDisjointFilter(geojson)
+
+    filter_class = getattr(temporal_filter, _TEMPORAL_FILTERS[kind])
+    if isinstance(param, (str, datetime.date, datetime.datetime)):
+        return filter_class(param)
+
+    if isinstance(param, (list, tuple)):
+        return filter_class(*param)
+
+    if isinstance(param, dict):
+        return filter_class(**param)
+
+    raise TypeError(
+        "'{}' のパラメータが解析できません".format(kind))
+
+
+def get_filters_from_options(options: Optional[dict] = None):
+    """
+    Parse, ParseStructured のオプションに含まれる
+    フィルタのリストを解析し、フィルタオブジェクトを作成して返す。
+    同じ条件のフィルタは ``_build_filter()`` がキャッシュしている
+    オブジェクトを再利用する。
+    """
+    options = options or _EMPTY_OPTIONS
+
+    filters = []
+    for kind in _FILTER_OPTION_KEYS:
+        if kind in options:
+            param_repr, is_json = _freeze_param(options.get(kind))
+            filters.append(_build_filter(kind, param_repr, is_json))
 
     return filters
 
@@ -270,7 +361,7 @@ def check_jageocoder_enabled():
     Jageocoder が利用できるかどうか確認します。
     利用できない場合は InvalidParamsError (-32602) を送ります。
     """
-    if not config.JAGEOCODER_TREE:
+    if jageocoder_tree() is None:
         raise InvalidParamsError(
             message="'geocoding' option is not available on this server.")
 
@@ -287,8 +378,40 @@ def version() -> str:
     return geonlp_api.__version__
 
 
+@lru_cache(maxsize=1024)
+def _cached_parse(sentence, options_json):
+    """
+    文と正規化した options の組ごとに parse の結果を
+    キャッシュして返します。
+
+    同じ文が同じ解析条件で繰り返しリクエストされる場合、
+    形態素解析とラティス構築を再実行せずに済みます。
+    キャッシュした FeatureCollection が書き換えられないよう、
+    呼び出し側は deepcopy したものを利用してください。
+    """
+    options = json.loads(options_json) if options_json else _EMPTY_OPTIONS
+
+    workflow = apply_geonlp_api_parse_options(options)
+    filters = get_filters_from_options(options)
+    geocoder = options.get('geocoding') in _GEOCODING_TRUE
+
+    if geocoder:
+        check_jageocoder_enabled()
+
+    workflow.set_jageocoder(geocoder)
+    workflow.filters = filters
+    result = workflow.geoparse(sentence)
+
+    feature_collection = {
+        "type": "FeatureCollection",
+        "features": result
+    }
+
+    return feature_collection
+
+
 @jsonrpc.method('geonlp.parse')
-def parse(sentence: str, options: Optional[dict] = {}) -> dict:
+def parse(sentence: str, options: Optional[dict] = None) -> dict:
     """
     テキストを geoparse します。
 
@@ -306,33 +429,17 @@ def parse(sentence: str, options: Optional[dict] = {}) -> dict:
         地名語、非地名語、住所をリストとして含む
         dict を返します。
     """
-    apply_geonlp_api_parse_options(options)
-    filters = get_filters_from_options(options)
-    if options.get('geocoding') in (True, 'true', 'True',):
-        geocoder = True
-    else:
-        geocoder = False
-
-    if geocoder:
-        check_jageocoder_enabled()
-
-    workflow = geonlp_api.default_workflow()
-    workflow.parser.set_jageocoder(geocoder)
-    workflow.filters = filters
-    result = workflow.geoparse(sentence)
-
-    feature_collection = {
-        "type": "FeatureCollection",
-        "features": result
-    }
+    options_json = json.dumps(
+        options, sort_keys=True, ensure_ascii=False, default=str) \
+        if options else ''
 
-    return feature_collection
+    return copy.deepcopy(_cached_parse(sentence, options_json))
 
 
 @jsonrpc.method('geonlp.parseStructured')
 def parse_structured(
         sentence_list: List[str],
-        options: Optional[dict] = {}) -> dict:
+        options: Optional[dict] = None) -> dict:
     """
     複数のセンテンスを geoparse します。
 
@@ -361,23 +468,22 @@ def parse_structured(
         地名語、非地名語、住所をリストとして含む
         dict を返します。
     """
-    apply_geonlp_api_parse_options(options)
+    options = options or _EMPTY_OPTIONS
+
+    workflow = apply_geonlp_api_parse_options(options)
     filters = get_filters_from_options(options)
-    if options.get('geocoding') in (True, 'true', 'True',):
-        geocoder = True
-    else:
-        geocoder = False
+    geocoder = options.get('geocoding') in _GEOCODING_TRUE
 
     if geocoder:
         check_jageocoder_enabled()
 
-    workflow = geonlp_api.default_workflow()
-    workflow.parser.set_jageocoder(geocoder)
+    workflow.set_jageocoder(geocoder)
     workflow.filters = filters
 
     result = []
+    extend = result.extend
     for sentence in sentence_list:
-        result += workflow.geoparse(sentence)
+        extend(workflow.geoparse(sentence))
 
     feature_collection = {
         "type": "FeatureCollection",
@@ -404,8 +510,8 @@ def search(key: str, options: Optional[dict] = None) -> dict:
     dict
         geolod_id をキー、地名語の情報を値に持つ dict
     """
-    apply_geonlp_api_parse_options(options)
-    return geonlp_api.searchWord(key)
+    workflow = apply_geonlp_api_parse_options(options)
+    return workflow.parser.service.searchWord(key)
 
 
 @jsonrpc.method('geonlp.getGeoInfo')
@@ -426,8 +532,20 @@ def get_geo_info(idlist: List[str], options: Optional[dict] = None) -> dict:
     dict
         geolod_id をキー、地名語の情報を値に持つ dict
     """
-    apply_geonlp_api_parse_options(options)
-    return geonlp_api.getWordInfo(idlist)
+    workflow = apply_geonlp_api_parse_options(options)
+    return workflow.parser.service.getWordInfo(idlist)
+
+
+@lru_cache(maxsize=1)
+def _installed_dictionary_ids():
+    """
+    インストール済み辞書の identifier をソートした tuple で返します。
+
+    インストール済み辞書はプロセスの実行中には変化しないため、
+    結果をキャッシュします。
+    """
+    return tuple(sorted(
+        x.get_identifier() for x in geonlp_api.getDictionaries()))
 
 
 @jsonrpc.method('geonlp.getDictionaries')
@@ -447,9 +565,23 @@ def get_dictionaries(options: Optional[dict] = None) -> list:
         辞書 identifier のリスト
     """
     apply_geonlp_api_parse_options(options)
-    return sorted(
-        [x.get_identifier() for x in geonlp_api.getDictionaries()]
-    )
+    return list(_installed_dictionary_ids())
+
+
+@lru_cache(maxsize=256)
+def _cached_dictionary_jsonld(identifier):
+    """
+    指定した identifier を持つ辞書の JSONLD メタデータを
+    キャッシュして返します。
+
+    辞書のメタデータはプロセスの実行中には変化しないため、
+    データベースへの問い合わせは identifier ごとに一度だけ行ないます。
+    """
+    metadata = geonlp_api.getDictionary(identifier)
+    if metadata:
+        return metadata.jsonld
+
+    return None
 
 
 @jsonrpc.method('geonlp.getDictionaryInfo')
@@ -475,11 +607,18 @@ def get_dictionary_info(
         identifier と一致する辞書が存在しない場合は None
     """
     apply_geonlp_api_parse_options(options)
-    metadata = geonlp_api.getDictionary(identifier)
-    if metadata:
-        return metadata.jsonld
+    return _cached_dictionary_jsonld(identifier)
 
-    return None
+
+@lru_cache(maxsize=4096)
+def _cached_address_search(address):
+    """
+    jageocoder.search() の結果をキャッシュして返します。
+
+    同じ住所文字列が繰り返し検索されることが多いため、
+    結果をサイズ上限付きでキャッシュします。
+    """
+    return jageocoder.search(address)
 
 
 @jsonrpc.method('geonlp.addressGeocoding')
@@ -497,11 +636,11 @@ def address_geocoding(address: str) -> dict:
     dict
         住所ジオコーディングの結果
     """
-    if not config.JAGEOCODER_TREE:
+    if jageocoder_tree() is None:
         raise MethodNotFoundError(
             message="'addressGeocoding' is not available on this server.")
 
-    return jageocoder.search(address)
+    return _cached_address_search(address)
 
 
 @app.route('/')
@@ -4,6 +4,7 @@ import pygeonlp.api as geonlp_api
 from pygeonlp.api.dict_manager import DictManager
 from pygeonlp.webapi.app import app
 from pygeonlp.webapi import config
+from pygeonlp.webapi.tests.helpers import flush_resreq
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -24,18 +25,34 @@ def createTempDatabase(tmp_path_factory):
         pass
 
 
-@pytest.fixture(scope="function", autouse=True)
+@pytest.fixture(scope="session", autouse=True)
 def setup():
     """
-    各テスト実行前に自動的に行なう処理を呼びだします。
+    テスト実行前に自動的に行なう処理を呼びだします。
     """
     app.config['TESTING'] = True
 
 
-@pytest.fixture
+@pytest.fixture(scope="session", autouse=True)
+def save_resreq():
+    """
+    write_resreq() でバッファしたリクエスト・レスポンスの
+    サンプルを、テストセッションの終了時にまとめて
+    ファイルに書き出します。
+    """
+    yield
+    flush_resreq()
+
+
+@pytest.fixture(scope="session")
 def client():
     """
     Flask アプリケーションのテストクライアントを返します。
+
+    クライアントとアプリケーションコンテキストの作成を
+    テストごとに繰り返さないよう、セッション全体で共有します。
+    解析条件はリクエストの options から毎回適用されるため、
+    テスト間で状態が持ち越されることはありません。
     """
     with app.test_client() as client:
         with app.app_context():
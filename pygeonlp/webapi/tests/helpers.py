@@ -7,6 +7,20 @@ def print_response(rv):
           file=sys.stderr)
 
 
+def _post_jsonrpc(client, query):
+    """
+    Post query to the server and return the raw response.
+
+    Let the Flask test client serialize dict queries so the JSON
+    round trip is done only once.
+    """
+    if isinstance(query, (dict, list)):
+        return client.post('/api', json=query)
+
+    headers = {"Content-Type": "application/json"}
+    return client.post('/api', data=query, headers=headers)
+
+
 def call_jsonrpc(client, query):
     """
     Send query and return the response.
@@ -22,14 +36,9 @@ def call_jsonrpc(client, query):
     any
         The JSON decoded value of the response.
     """
-    if isinstance(query, dict):
-        query = json.dumps(query)
-
-    headers = {"Content-Type": "application/json"}
-    rv = client.post('/api', data=query, headers=headers)
+    rv = _post_jsonrpc(client, query)
     assert rv.status_code == 200
-    response_object = json.loads(rv.data)
-    return response_object
+    return rv.get_json()
 
 
 def validate_jsonrpc(client, query, expected):
@@ -66,6 +75,57 @@ def validate_jsonrpc(client, query, expected):
     return result
 
 
+def validate_jsonrpc_batch(client, queries, expecteds):
+    """
+    Send queries as one JSON-RPC 2.0 batch request and
+    compare each result with the expected value.
+
+    Sending a batch amortizes the HTTP round trip and the
+    request setup over all queries in the list.
+
+    Parameters
+    ----------
+    client: client fixture
+    queries: list of dict
+        The query objects to POST to the server
+        as a single batch, in decoded JSON format.
+        Each query must have a unique 'id'.
+    expecteds: list of any
+        The values expected as results, in the same
+        order as queries.
+
+        When '*' is passed as an expected value,
+        any response will pass.
+
+    Return
+    ------
+    list of any
+        The JSON decoded values stored in the 'result'
+        fields of the responses, in the same order
+        as queries.
+    """
+    rv = _post_jsonrpc(client, queries)
+    assert rv.status_code == 200
+    responses = rv.get_json()
+    assert isinstance(responses, list)
+    assert len(responses) == len(queries)
+
+    # バッチ応答の順序は保証されないため id で対応付ける
+    result_by_id = {res['id']: res['result'] for res in responses}
+    results = []
+    for query, expected in zip(queries, expecteds):
+        result = result_by_id[query['id']]
+        if expected != '*':
+            if result != expected:
+                print("result: '{}'".format(result), file=sys.stderr)
+
+            assert result == expected
+
+        results.append(result)
+
+    return results
+
+
 def validate_jsonrpc_error(client, query, expected_code):
     """
     Send query and compare the status code with expected_code.
@@ -79,17 +139,20 @@ def validate_jsonrpc_error(client, query, expected_code):
     expected_code: int
         The expected status_code.
     """
-    if isinstance(query, dict):
-        query = json.dumps(query)
-
-    headers = {"Content-Type": "application/json"}
-    rv = client.post('/api', data=query, headers=headers)
+    rv = _post_jsonrpc(client, query)
     assert rv.status_code == expected_code
 
 
+_resreq_buffer = []
+
+
 def write_resreq(request, response):
     """
-    Write request and response JSON into files.
+    Register request and response JSON to be written into files.
+
+    The pairs are buffered in memory and written in one pass
+    when flush_resreq() is called at the end of the test
+    session, so that each test does not pay the file I/O cost.
 
     Notes
     -----
@@ -104,8 +167,18 @@ def write_resreq(request, response):
     response: dict
         The response in decoded JSON format.
     """
-    basename = request['id']
-    with open("docs/source/json/{}_req.json".format(basename), "w") as f:
-        json.dump(request, f, indent=2, ensure_ascii=False)
-    with open("docs/source/json/{}_res.json".format(basename), "w") as f:
-        json.dump(response, f, indent=2, ensure_ascii=False)
+    _resreq_buffer.append((request, response))
+
+
+def flush_resreq():
+    """
+    Write all buffered request and response pairs into files.
+    """
+    for request, response in _resreq_buffer:
+        basename = request['id']
+        with open("docs/source/json/{}_req.json".format(basename), "w") as f:
+            json.dump(request, f, indent=2, ensure_ascii=False)
+        with open("docs/source/json/{}_res.json".format(basename), "w") as f:
+            json.dump(response, f, indent=2, ensure_ascii=False)
+
+    _resreq_buffer.clear()
@@ -1,4 +1,9 @@
-from pygeonlp.webapi.tests.helpers import validate_jsonrpc, write_resreq
+import types
+
+import pytest
+
+from pygeonlp.webapi.tests.helpers import (
+    validate_jsonrpc, validate_jsonrpc_batch, write_resreq)
 
 """
 GDAL がインストールされているかどうかをチェックします
@@ -12,6 +17,49 @@ except ModuleNotFoundErrlr:
 """
 
 
+# test_search と test_getGeoInfo_idlist で共通に期待される
+# 「国会議事堂前」の地名語エントリ
+# 変更されないよう MappingProxyType で保護する
+KOKKAI_GIJIDOMAE_ENTRIES = types.MappingProxyType({
+    'Bn4q6d': {
+        'body': '国会議事堂前', 'dictionary_id': 3,
+        'dictionary_identifier': 'geonlp:ksj-station-N02',
+        'entry_id': 'LrGGxY', 'geolod_id': 'Bn4q6d',
+        'hypernym': ['東京地下鉄', '4号線丸ノ内線'],
+        'institution_type': '民営鉄道',
+        'latitude': '35.674845',
+        'longitude': '139.74534166666666',
+        'ne_class': '鉄道施設/鉄道駅',
+        'railway_class': '普通鉄道',
+        'suffix': ['駅', '']
+    },
+    'cE8W4w': {
+        'body': '国会議事堂前', 'dictionary_id': 3,
+        'dictionary_identifier': 'geonlp:ksj-station-N02',
+        'entry_id': '4NFELa',
+        'geolod_id': 'cE8W4w',
+        'hypernym': ['東京地下鉄', '9号線千代田線'],
+        'institution_type': '民営鉄道',
+        'latitude': '35.673543333333335',
+        'longitude': '139.74305333333334',
+        'ne_class': '鉄道施設/鉄道駅',
+        'railway_class': '普通鉄道',
+        'suffix': ['駅', '']
+    }
+})
+
+# テストで期待される形態素表記列
+# テストごとに split() し直さないよう import 時に tuple で作成する
+WORDS_JIMBOCHO = tuple('NII/は/神保町駅/から/徒歩/7/分/です/。'.split('/'))
+WORDS_HITOTSUBASHI_GEOCODED = tuple(
+    'NII/は/千代田区一ツ橋2-1-/2/に/あり/ます/。'.split('/'))
+WORDS_HITOTSUBASHI = tuple(
+    'NII/は/千代田区/一ツ橋/2/-/1/-/2/に/あり/ます/。'.split('/'))
+WORDS_TAKEBASHI = tuple('竹橋駅/も/近い/です/。'.split('/'))
+WORDS_STRUCTURED = (
+    WORDS_JIMBOCHO + WORDS_HITOTSUBASHI[2:] + WORDS_TAKEBASHI)
+
+
 class TestBasicApi:
     """
     基本的な API のテスト
@@ -49,7 +97,7 @@ class TestBasicApi:
         features = result['features']
 
         # 形態素解析のチェック
-        words = 'NII/は/神保町駅/から/徒歩/7/分/です/。'.split('/')
+        words = WORDS_JIMBOCHO
         for pos, feature in enumerate(features):
             prop = feature['properties']
             assert prop['surface'] == words[pos]  # 表記が一致
@@ -82,7 +130,7 @@ class TestBasicApi:
         features = result['features']
 
         # 形態素解析のチェック
-        words = 'NII/は/千代田区一ツ橋2-1-/2/に/あり/ます/。'.split('/')
+        words = WORDS_HITOTSUBASHI_GEOCODED
         for pos, feature in enumerate(features):
             prop = feature['properties']
             assert prop['surface'] == words[pos]  # 表記が一致
@@ -115,7 +163,7 @@ class TestBasicApi:
         features = result['features']
 
         # 形態素解析のチェック
-        words = 'NII/は/千代田区/一ツ橋/2/-/1/-/2/に/あり/ます/。'.split('/')
+        words = WORDS_HITOTSUBASHI
         for pos, feature in enumerate(features):
             prop = feature['properties']
             assert prop['surface'] == words[pos]  # 表記が一致
@@ -150,9 +198,7 @@ class TestBasicApi:
         features = result['features']
 
         # 形態素解析のチェック
-        words = 'NII/は/神保町駅/から/徒歩/7/分/です/。'.split('/') +\
-            '千代田区/一ツ橋/2/-/1/-/2/に/あり/ます/。'.split('/') +\
-            '竹橋駅/も/近い/です/。'.split('/')
+        words = WORDS_STRUCTURED
         for pos, feature in enumerate(features):
             prop = feature['properties']
             assert prop['surface'] == words[pos]  # 表記が一致
@@ -173,33 +219,7 @@ class TestBasicApi:
             'params': {'key': '国会議事堂前'},
             'id': 'test_search',
         }
-        expected = {
-            'Bn4q6d': {
-                'body': '国会議事堂前', 'dictionary_id': 3,
-                'dictionary_identifier': 'geonlp:ksj-station-N02',
-                'entry_id': 'LrGGxY', 'geolod_id': 'Bn4q6d',
-                'hypernym': ['東京地下鉄', '4号線丸ノ内線'],
-                'institution_type': '民営鉄道',
-                'latitude': '35.674845',
-                'longitude': '139.74534166666666',
-                'ne_class': '鉄道施設/鉄道駅',
-                'railway_class': '普通鉄道',
-                'suffix': ['駅', '']
-            },
-            'cE8W4w': {
-                'body': '国会議事堂前', 'dictionary_id': 3,
-                'dictionary_identifier': 'geonlp:ksj-station-N02',
-                'entry_id': '4NFELa',
-                'geolod_id': 'cE8W4w',
-                'hypernym': ['東京地下鉄', '9号線千代田線'],
-                'institution_type': '民営鉄道',
-                'latitude': '35.673543333333335',
-                'longitude': '139.74305333333334',
-                'ne_class': '鉄道施設/鉄道駅',
-                'railway_class': '普通鉄道',
-                'suffix': ['駅', '']
-            }
-        }
+        expected = KOKKAI_GIJIDOMAE_ENTRIES
         result = validate_jsonrpc(client, query, expected)
         write_resreq(query, result)
 
@@ -212,33 +232,7 @@ class TestBasicApi:
             'params': {'idlist': ['Bn4q6d', 'cE8W4w']},
             'id': 'test_getGeoInfo_idlist',
         }
-        expected = {
-            'Bn4q6d': {
-                'body': '国会議事堂前', 'dictionary_id': 3,
-                'dictionary_identifier': 'geonlp:ksj-station-N02',
-                'entry_id': 'LrGGxY', 'geolod_id': 'Bn4q6d',
-                'hypernym': ['東京地下鉄', '4号線丸ノ内線'],
-                'institution_type': '民営鉄道',
-                'latitude': '35.674845',
-                'longitude': '139.74534166666666',
-                'ne_class': '鉄道施設/鉄道駅',
-                'railway_class': '普通鉄道',
-                'suffix': ['駅', '']
-            },
-            'cE8W4w': {
-                'body': '国会議事堂前', 'dictionary_id': 3,
-                'dictionary_identifier': 'geonlp:ksj-station-N02',
-                'entry_id': '4NFELa',
-                'geolod_id': 'cE8W4w',
-                'hypernym': ['東京地下鉄', '9号線千代田線'],
-                'institution_type': '民営鉄道',
-                'latitude': '35.673543333333335',
-                'longitude': '139.74305333333334',
-                'ne_class': '鉄道施設/鉄道駅',
-                'railway_class': '普通鉄道',
-                'suffix': ['駅', '']
-            }
-        }
+        expected = KOKKAI_GIJIDOMAE_ENTRIES
         result = validate_jsonrpc(client, query, expected)
         write_resreq(query, result)
 
@@ -309,299 +303,133 @@ class TestBasicApi:
         result = validate_jsonrpc(client, query, expected)
         write_resreq(query, result)
 
-
-class TestParseOptions:
-    """
-    Parse options のテスト
-    """
-
-    def test_parse_option_set_dic(self, client):
-        """
-        Test 'set-dic' option.
-
-        Notes
-        -----
-        'set-dic' に r'geoshape' を指定すると、
-        identifier に 'geoshape' を含む辞書だけが利用されます。
-
-        'geoshape-city' が利用できるため、
-        「和歌山市（市）」に解決されます。
-        """
-        query = {
-            'method': 'geonlp.parse',
-            'params': {
-                'sentence': '和歌山市は晴れ。',
-                'options': {'set-dic': r'geoshape'}
-            },
-            'id': 'test_parse_set_dic',
-        }
-        expected = '*'
-        result = validate_jsonrpc(client, query, expected)
-
-        # GeoJSON Feature Collection のチェック
-        assert result['type'] == 'FeatureCollection'
-        assert 'features' in result
-        features = result['features']
-
-        # 地名語のチェック
-        prop = features[0]['properties']
-        assert prop['surface'] == '和歌山市'
-        assert prop['geoword_properties']['geolod_id'] == 'lQccqK'
-
-        write_resreq(query, result)
-
-    def test_parse_option_set_dic_list(self, client):
-        """
-        Test 'set-dic' option with list of identifiers.
-
-        Notes
-        -----
-        'set-dic' に ['geoshape'] を指定すると、
-        identifier が 'geoshape' と文字列として等しい辞書だけが
-        利用されます。
-
-        一致する辞書は無いため、「和歌山」に解決されます。
-        """
-        query = {
-            'method': 'geonlp.parse',
-            'params': {
-                'sentence': '和歌山市は晴れ。',
-                'options': {'set-dic': ['geoshape']}
-            },
-            'id': 'test_parse_set_dic_list',
-        }
-        expected = '*'
-        result = validate_jsonrpc(client, query, expected)
-
-        # GeoJSON Feature Collection のチェック
-        assert result['type'] == 'FeatureCollection'
-        assert 'features' in result
-        features = result['features']
-
-        # 地名語のチェック
-        prop = features[0]['properties']
-        assert prop['surface'] == '和歌山'
-        assert 'geoword_properties' not in prop
-
-    def test_parse_option_remove_dic(self, client):
-        """
-        Test 'remove-dic' option.
-
-        Notes
-        -----
-        'remove-dic' に r'station' を指定すると、
-        identifier に 'station' を含む辞書は利用されません。
-
-        'geoshape-city' が利用できるため、
-        「和歌山市（市）」に解決されます。
-        """
-        query = {
-            'method': 'geonlp.parse',
-            'params': {
-                'sentence': '和歌山市は晴れ。',
-                'options': {'remove-dic': r'station'}
-            },
-            'id': 'test_parse_remove_dic',
-        }
-        expected = '*'
-        result = validate_jsonrpc(client, query, expected)
-
-        # GeoJSON Feature Collection のチェック
-        assert result['type'] == 'FeatureCollection'
-        assert 'features' in result
-        features = result['features']
-
-        # 地名語のチェック
-        prop = features[0]['properties']
-        assert prop['surface'] == '和歌山市'
-        assert prop['geoword_properties']['dictionary_identifier'] == \
-            'geonlp:geoshape-city'
-
-        write_resreq(query, result)
-
-    def test_parse_option_add_dic(self, client):
+    def test_batch_request(self, client):
         """
-        Test 'add-dic' option.
-
-        Notes
-        -----
-        'add-dic' に r'city' を指定すると、
-        'remove-dic' で除外指定されていても、
-        identifier に 'city' を含む辞書は利用されます。
+        Test JSON-RPC 2.0 batch request.
 
-        'geoshape-city' は 'remove-dic' で除外されますが
-        'add-dic' で追加されるため利用可能になり、
-        「和歌山市（市）」に解決されます。
+        複数のクエリを1回の POST にまとめて送っても、
+        個別に送った場合と同じ結果が得られることを確認する。
         """
-        query = {
-            'method': 'geonlp.parse',
-            'params': {
-                'sentence': '和歌山市は晴れ。',
-                'options': {'remove-dic': r'.*',
-                            'add-dic': r'city'}
-            },
-            'id': 'test_parse_add_dic',
-        }
-        expected = '*'
-        result = validate_jsonrpc(client, query, expected)
-
-        # GeoJSON Feature Collection のチェック
-        assert result['type'] == 'FeatureCollection'
-        assert 'features' in result
-        features = result['features']
-
-        # 地名語のチェック
-        prop = features[0]['properties']
-        assert prop['surface'] == '和歌山市'
-        assert prop['geoword_properties']['dictionary_identifier'] == \
-            'geonlp:geoshape-city'
-
-        write_resreq(query, result)
-
-    def test_parse_option_set_class(self, client):
-        """
-        Test 'set-class' option.
-
-        Notes
-        -----
-        'set-class' に [r'.*', r'-鉄道施設/.*'] を指定すると、
-        全ての固有名クラスから '鉄道施設/.*' を除いたものを持つ
-        地名語を候補として利用します。
-
-        「和歌山市（駅）」は鉄道施設なので除外され、
-        「和歌山市（市）」に解決されます。
-        """
-        query = {
-            'method': 'geonlp.parse',
-            'params': {
-                'sentence': '和歌山市は晴れ。',
-                'options': {'set-class': [r'.*', r'-鉄道施設/.*']}
+        import pygeonlp.api
+        queries = [
+            {
+                'jsonrpc': '2.0',
+                'method': 'geonlp.version',
+                'params': {},
+                'id': 'test_batch_version',
             },
-            'id': 'test_parse_set_class',
-        }
-        expected = '*'
-        result = validate_jsonrpc(client, query, expected)
-
-        # GeoJSON Feature Collection のチェック
-        assert result['type'] == 'FeatureCollection'
-        assert 'features' in result
-        features = result['features']
-
-        # 地名語のチェック
-        prop = features[0]['properties']
-        assert prop['surface'] == '和歌山市'
-        assert prop['geoword_properties']['dictionary_identifier'] == \
-            'geonlp:geoshape-city'
-
-        write_resreq(query, result)
-
-    def test_parse_option_set_class_except(self, client):
-        """
-        Test 'set-class' option.
-
-        Notes
-        -----
-        'set-class' に [r'.*', r'-鉄道施設/.*', r'鉄道施設/鉄道駅'] を
-        指定すると、この順番に評価するため「鉄道駅」は利用されます。
-
-        「和歌山市（駅）」は鉄道施設/鉄道駅なので対象になります。
-        """
-        query = {
-            'method': 'geonlp.parse',
-            'params': {
-                'sentence': '和歌山市は晴れ。',
-                'options': {'set-class': [
-                    r'.*', r'-鉄道施設/.*', r'.*駅$'
-                ]}
+            {
+                'jsonrpc': '2.0',
+                'method': 'geonlp.parse',
+                'params': {'sentence': 'NIIは神保町駅から徒歩7分です。'},
+                'id': 'test_batch_parse',
             },
-            'id': 'test_parse_set_class_except',
-        }
-        expected = '*'
-        result = validate_jsonrpc(client, query, expected)
+        ]
+        expecteds = [pygeonlp.api.__version__, '*']
+        results = validate_jsonrpc_batch(client, queries, expecteds)
 
         # GeoJSON Feature Collection のチェック
-        assert result['type'] == 'FeatureCollection'
-        assert 'features' in result
-        features = result['features']
+        assert results[1]['type'] == 'FeatureCollection'
+        words = WORDS_JIMBOCHO
+        for pos, feature in enumerate(results[1]['features']):
+            assert feature['properties']['surface'] == words[pos]
 
-        # 地名語のチェック
-        prop = features[0]['properties']
-        assert prop['surface'] == '和歌山市'
-        assert prop['geoword_properties']['dictionary_identifier'] == \
-            'geonlp:ksj-station-N02'
 
-    def test_parse_option_add_class(self, client):
-        """
-        Test 'add-class' option.
-
-        Notes
-        -----
-        'add-class' で利用するクラスのリストを指定できます。
-
-        'add-class' に [r'-.*', '市区町村'] を指定すると、
-        全ての固有名クラスを対象クラスから除外し、
-        次に「市区町村」クラスの地名語を対象に加えます。
-
-        「和歌山市（駅）」は鉄道施設なので除外され、
-        「和歌山市（市）」に解決されます。
-        """
-        query = {
-            'method': 'geonlp.parse',
-            'params': {
-                'sentence': '和歌山市は晴れ。',
-                'options': {'add-class': [
-                    r'-.*', '市区町村'
-                ]}
-            },
-            'id': 'test_parse_add_class',
-        }
-        expected = '*'
-        result = validate_jsonrpc(client, query, expected)
-
-        # GeoJSON Feature Collection のチェック
-        assert result['type'] == 'FeatureCollection'
-        assert 'features' in result
-        features = result['features']
-
-        # 地名語のチェック
-        prop = features[0]['properties']
-        assert prop['surface'] == '和歌山市'
-        assert prop['geoword_properties']['dictionary_identifier'] == \
-            'geonlp:geoshape-city'
-
-        write_resreq(query, result)
-
-    def test_parse_option_remove_class(self, client):
-        """
-        Test 'remove-class' option.
-
-        Notes
-        -----
-        'set-class' で一度に指定する代わりに、
-        'remove-class' で除外するクラスのリストを指定できます。
-
-        'remove-class' に [r'.*', '-市区町村'] を指定すると、
-        全ての固有名クラスを対象クラスから除外し、
-        次に「市区町村」クラスの地名語を対象に加えます。
+class TestParseOptions:
+    """
+    Parse options のテスト
 
-        'remove-class' のリストではクラス名の先頭に '-' を付けると
-        追加の意味になります。
+    いずれも「和歌山市は晴れ。」を異なるオプションで解析し、
+    先頭の地名語がどの候補に解決されるかを確認する。
+    各ケースの期待値の理由は PARSE_OPTION_CASES のコメントを
+    参照のこと。
+    """
 
-        「和歌山市（駅）」は鉄道施設なので除外され、
-        「和歌山市（市）」に解決されます。
+    # (クエリ id, options, 期待される表記,
+    #  geoword_properties で確認する (キー, 値) または None,
+    #  write_resreq でサンプルを書き出すかどうか)
+    PARSE_OPTION_CASES = [
+        # 'set-dic' に r'geoshape' を指定すると、identifier が
+        # 正規表現 'geoshape' にマッチする辞書だけが利用される
+        ('test_parse_set_dic',
+         {'set-dic': r'geoshape'},
+         '和歌山市', ('geolod_id', 'lQccqK'), True),
+
+        # 'set-dic' に ['geoshape'] を指定すると、identifier が
+        # 'geoshape' と文字列として等しい辞書だけが利用される
+        # 一致する辞書は無いため、「和歌山」に解決される
+        ('test_parse_set_dic_list',
+         {'set-dic': ['geoshape']},
+         '和歌山', None, False),
+
+        # 'remove-dic' に r'station' を指定すると、identifier に
+        # 'station' を含む辞書は利用されない
+        # 'geoshape-city' が利用できるため「和歌山市（市）」に解決される
+        ('test_parse_remove_dic',
+         {'remove-dic': r'station'},
+         '和歌山市', ('dictionary_identifier', 'geonlp:geoshape-city'), True),
+
+        # 'add-dic' に r'city' を指定すると、'remove-dic' で
+        # 除外指定されていても identifier に 'city' を含む辞書は
+        # 利用される
+        ('test_parse_add_dic',
+         {'remove-dic': r'.*', 'add-dic': r'city'},
+         '和歌山市', ('dictionary_identifier', 'geonlp:geoshape-city'), True),
+
+        # 'set-class' に [r'.*', r'-鉄道施設/.*'] を指定すると、
+        # 全ての固有名クラスから '鉄道施設/.*' を除いたものを持つ
+        # 地名語を候補として利用する
+        # 「和歌山市（駅）」は除外され「和歌山市（市）」に解決される
+        ('test_parse_set_class',
+         {'set-class': [r'.*', r'-鉄道施設/.*']},
+         '和歌山市', ('dictionary_identifier', 'geonlp:geoshape-city'), True),
+
+        # 'set-class' のリストは順番に評価されるため、最後に
+        # r'.*駅$' を追加すると「鉄道駅」は利用される
+        ('test_parse_set_class_except',
+         {'set-class': [r'.*', r'-鉄道施設/.*', r'.*駅$']},
+         '和歌山市',
+         ('dictionary_identifier', 'geonlp:ksj-station-N02'), False),
+
+        # 'add-class' に [r'-.*', '市区町村'] を指定すると、
+        # 全ての固有名クラスを対象から除外し、次に「市区町村」
+        # クラスの地名語を対象に加える
+        ('test_parse_add_class',
+         {'add-class': [r'-.*', '市区町村']},
+         '和歌山市', ('dictionary_identifier', 'geonlp:geoshape-city'), True),
+
+        # 'remove-class' のリストではクラス名の先頭に '-' を付けると
+        # 追加の意味になる
+        ('test_parse_remove_class',
+         {'remove-class': [r'.*', '-市区町村']},
+         '和歌山市', ('dictionary_identifier', 'geonlp:geoshape-city'), True),
+
+        # 'add-class' と 'remove-class' を同時に指定した場合は
+        # 必ず 'remove-class' が先に評価される
+        ('test_parse_add_remove_class',
+         {'add-class': ['市区町村'], 'remove-class': [r'.*']},
+         '和歌山市',
+         ('dictionary_identifier', 'geonlp:geoshape-city'), False),
+    ]
+
+    @pytest.mark.parametrize(
+        'query_id,options,surface,geoword_check,save',
+        PARSE_OPTION_CASES,
+        ids=[case[0] for case in PARSE_OPTION_CASES])
+    def test_parse_options(self, client, query_id, options,
+                           surface, geoword_check, save):
+        """
+        Test parse options.
         """
         query = {
             'method': 'geonlp.parse',
             'params': {
                 'sentence': '和歌山市は晴れ。',
-                'options': {'remove-class': [
-                    r'.*', '-市区町村'
-                ]}
+                'options': options
             },
-            'id': 'test_parse_remove_class',
+            'id': query_id,
         }
-        expected = '*'
-        result = validate_jsonrpc(client, query, expected)
+        result = validate_jsonrpc(client, query, '*')
 
         # GeoJSON Feature Collection のチェック
         assert result['type'] == 'FeatureCollection'
@@ -610,54 +438,15 @@ class TestParseOptions:
 
         # 地名語のチェック
         prop = features[0]['properties']
-        assert prop['surface'] == '和歌山市'
-        assert prop['geoword_properties']['dictionary_identifier'] == \
-            'geonlp:geoshape-city'
-
-        write_resreq(query, result)
-
-    def test_parse_option_add_remove_class(self, client):
-        """
-        Test 'add-class' + 'remove-class' options.
-
-        Notes
-        -----
-        'set-class' で一度に指定する代わりに、
-        'add-class' で利用するクラスのリストを、
-        'remove-class' で除外するクラスのリストを指定できます。
-
-        ただし必ず 'remove-class' が先に評価されます。
-
-        'add-class' で ['市区町村'] を、
-        'remove-class' で [r'.*'] を指定すると、
-        全ての固有名クラスを対象クラスから除外し、
-        次に「市区町村」クラスの地名語を対象に加えます。
-
-        「和歌山市（駅）」は鉄道施設なので除外され、
-        「和歌山市（市）」に解決されます。
-        """
-        query = {
-            'method': 'geonlp.parse',
-            'params': {
-                'sentence': '和歌山市は晴れ。',
-                'options': {'add-class': ['市区町村'],
-                            'remove-class': [r'.*']}
-            },
-            'id': 'test_parse_add_remove_class',
-        }
-        expected = '*'
-        result = validate_jsonrpc(client, query, expected)
+        assert prop['surface'] == surface
+        if geoword_check is None:
+            assert 'geoword_properties' not in prop
+        else:
+            key, value = geoword_check
+            assert prop['geoword_properties'][key] == value
 
-        # GeoJSON Feature Collection のチェック
-        assert result['type'] == 'FeatureCollection'
-        assert 'features' in result
-        features = result['features']
-
-        # 地名語のチェック
-        prop = features[0]['properties']
-        assert prop['surface'] == '和歌山市'
-        assert prop['geoword_properties']['dictionary_identifier'] == \
-            'geonlp:geoshape-city'
+        if save:
+            write_resreq(query, result)
 
 
 class TestSpatialFilters:
@@ -748,116 +537,92 @@ class TestSpatialFilters:
 class TestTemporalFilters:
     """
     TemporalFilter のテスト
+
+    いずれも田無市・保谷市が西東京市に合併された文を
+    異なる時間フィルタで解析し、各市がどの時点で地名語として
+    扱われるかを確認する。
+    各ケースの期待値の理由は TIME_FILTER_CASES のコメントを
+    参照のこと。
     """
 
     sentence = ('田無市と保谷市は2001年1月21日に合併して'
                 '西東京市になりました。')
 
-    def test_time_exists(self, client):
-        """
-        Test 'time-exists' filter.
-
-        Notes
-        -----
-        'time-exists' に日時または日時のペアを指定すると、
-        その時点・期間に存在した地名語だけが候補になります。
-
-        西東京市は指定した期間内に設置されたので
-        田無市と保谷市、西東京市は全て地名語になります。
-        """
-        query = {
-            'method': 'geonlp.parse',
-            'params': {
-                'sentence': self.sentence,
-                'options': {
-                    'time-exists': ['2000-01-01', '2001-02-01']
-                }
-            },
-            'id': 'test_time_exists',
-        }
-        expected = '*'
-        result = validate_jsonrpc(client, query, expected)
-
-        # GeoJSON Feature Collection のチェック
-        assert result['type'] == 'FeatureCollection'
-        assert 'features' in result
-        features = result['features']
-
-        # 地名語のチェック
-        for feature in features:
-            prop = feature['properties']
-            if prop['surface'] in ('田無市', '保谷市', '西東京市',):
-                assert prop['node_type'] == 'GEOWORD'
-            else:
-                assert prop['node_type'] == 'NORMAL'
-
-        write_resreq(query, result)
-
-    def test_time_exists_single_value(self, client):
-        """
-        Test 'time-exists' filter with single value.
-
-        Notes
-        -----
-        'time-exists' に日時または日時を1つ指定すると、
-        その時点に存在した地名語だけが候補になります。
-
-        西東京市は指定した時点にはまだ設置されていないので
-        田無市と保谷市が地名語、西東京市は固有名詞になります。
-        """
-        query = {
-            'method': 'geonlp.parse',
-            'params': {
-                'sentence': self.sentence,
-                'options': {
-                    'time-exists': '2000-01-01'
-                }
-            },
-            'id': 'test_time_exists',
-        }
-        expected = '*'
-        result = validate_jsonrpc(client, query, expected)
-
-        # GeoJSON Feature Collection のチェック
-        assert result['type'] == 'FeatureCollection'
-        assert 'features' in result
-        features = result['features']
-
-        # 地名語のチェック
-        for feature in features:
-            prop = feature['properties']
-            if prop['surface'] in ('田無市', '保谷市',):
-                assert prop['node_type'] == 'GEOWORD'
-            elif prop['surface'] in ('西東京市',):
-                assert prop['node_type'] == 'NORMAL'
-            else:
-                assert prop['node_type'] == 'NORMAL'
-
-    def test_time_exists_dict(self, client):
-        """
-        Test 'time-exists' filter with dict values.
-
-        Notes
-        -----
-        'time-exists' に 'date_from' と 'date_to' を持つ
-        dict を指定すると、
-        その期間に存在した地名語だけが候補になります。
-
-        西東京市は指定した期間内に設置されたので
-        田無市と保谷市、西東京市は全て地名語になります。
+    # (クエリ id, options, 地名語になる表記のタプル,
+    #  write_resreq でサンプルを書き出すかどうか)
+    TIME_FILTER_CASES = [
+        # 'time-exists' に日時のペアを指定すると、
+        # その期間に存在した地名語だけが候補になる
+        # 西東京市は指定した期間内に設置されたので
+        # 田無市と保谷市、西東京市は全て地名語になる
+        ('test_time_exists',
+         {'time-exists': ['2000-01-01', '2001-02-01']},
+         ('田無市', '保谷市', '西東京市'), True),
+
+        # 'time-exists' に日時を1つ指定すると、
+        # その時点に存在した地名語だけが候補になる
+        # 西東京市は指定した時点にはまだ設置されていないので
+        # 田無市と保谷市が地名語、西東京市は固有名詞になる
+        ('test_time_exists_single_value',
+         {'time-exists': '2000-01-01'},
+         ('田無市', '保谷市'), False),
+
+        # 'time-exists' に 'date_from' と 'date_to' を持つ dict を
+        # 指定すると、その期間に存在した地名語だけが候補になる
+        ('test_time_exists_dict',
+         {'time-exists': {'date_from': '2000-01-01',
+                          'date_to': '2001-02-01'}},
+         ('田無市', '保谷市', '西東京市'), False),
+
+        # 'time-before' を指定すると、その時点・期間の開始時より
+        # 前に存在した地名語だけが候補になる
+        # 西東京市は指定した期間の開始時より後に設置されたので
+        # 田無市と保谷市が地名語、西東京市は固有名詞になる
+        ('test_time_before',
+         {'time-before': ['2000-01-01', '2001-02-01']},
+         ('田無市', '保谷市'), True),
+
+        # 'time-after' を指定すると、その時点・期間の終了時より
+        # 後に存在した地名語だけが候補になる
+        # 田無市と保谷市は指定した期間の終了時より前に廃止されたので
+        # 田無市と保谷市は固有名詞、西東京市は地名語になる
+        ('test_time_after',
+         {'time-after': ['2000-01-01', '2001-02-01']},
+         ('西東京市',), True),
+
+        # 'time-overlaps' を指定すると、その時点・期間と重なる
+        # 期間に存在した地名語だけが候補になる
+        # 西東京市は指定した期間内に設置されたので
+        # 田無市と保谷市、西東京市は全て地名語になる
+        ('test_time_overlaps',
+         {'time-overlaps': ['2000-01-01', '2001-02-01']},
+         ('田無市', '保谷市', '西東京市'), True),
+
+        # 'time-covers' を指定すると、その期間の開始時から終了時
+        # まで存在し続けた地名語だけが候補になる
+        # 西東京市は指定した期間内に設置され、田無市と保谷市は
+        # 期間内に廃止されたので、全て固有名詞になる
+        ('test_time_covers',
+         {'time-covers': ['2000-01-01', '2001-02-01']},
+         (), True),
+    ]
+
+    @pytest.mark.parametrize(
+        'query_id,options,geoword_surfaces,save',
+        TIME_FILTER_CASES,
+        ids=[case[0] for case in TIME_FILTER_CASES])
+    def test_time_filters(self, client, query_id, options,
+                          geoword_surfaces, save):
+        """
+        Test temporal filters.
         """
         query = {
             'method': 'geonlp.parse',
             'params': {
                 'sentence': self.sentence,
-                'options': {
-                    'time-exists': {
-                        'date_from': '2000-01-01',
-                        'date_to': '2001-02-01'
-                    }
-                }
+                'options': options
             },
-            'id': 'test_time_exists_dict',
+            'id': query_id,
         }
         expected = '*'
         result = validate_jsonrpc(client, query, expected)
@@ -870,173 +635,10 @@ class TestTemporalFilters:
         # 地名語のチェック
         for feature in features:
             prop = feature['properties']
-            if prop['surface'] in ('田無市', '保谷市', '西東京市',):
+            if prop['surface'] in geoword_surfaces:
                 assert prop['node_type'] == 'GEOWORD'
             else:
                 assert prop['node_type'] == 'NORMAL'
 
-    def test_time_before(self, client):
-        """
-        Test 'time-before' filter.
-
-        Notes
-        -----
-        'time-before' に日時または日時のペアを指定すると、
-        その時点・期間の開始時より前に存在した地名語だけが
-        候補になります。
-
-        西東京市は指定した期間の開始時より後に設置されたので
-        田無市と保谷市が地名語、西東京市は固有名詞になります。
-        """
-        query = {
-            'method': 'geonlp.parse',
-            'params': {
-                'sentence': self.sentence,
-                'options': {
-                    'time-before': ['2000-01-01', '2001-02-01']
-                }
-            },
-            'id': 'test_time_before',
-        }
-        expected = '*'
-        result = validate_jsonrpc(client, query, expected)
-
-        # GeoJSON Feature Collection のチェック
-        assert result['type'] == 'FeatureCollection'
-        assert 'features' in result
-        features = result['features']
-
-        # 地名語のチェック
-        for feature in features:
-            prop = feature['properties']
-            if prop['surface'] in ('田無市', '保谷市',):
-                assert prop['node_type'] == 'GEOWORD'
-            elif prop['surface'] in ('西東京市',):
-                assert prop['node_type'] == 'NORMAL'
-            else:
-                assert prop['node_type'] == 'NORMAL'
-
-        write_resreq(query, result)
-
-    def test_time_after(self, client):
-        """
-        Test 'time-after' filter.
-
-        Notes
-        -----
-        'time-after' に日時または日時のペアを指定すると、
-        その時点・期間の終了時より後に存在した地名語だけが
-        候補になります。
-
-        田無市と保谷市は指定した期間の終了時より前に廃止されたので
-        田無市と保谷市は固有名詞、西東京市は地名語になります。
-        """
-        query = {
-            'method': 'geonlp.parse',
-            'params': {
-                'sentence': self.sentence,
-                'options': {
-                    'time-after': ['2000-01-01', '2001-02-01']
-                }
-            },
-            'id': 'test_time_after',
-        }
-        expected = '*'
-        result = validate_jsonrpc(client, query, expected)
-
-        # GeoJSON Feature Collection のチェック
-        assert result['type'] == 'FeatureCollection'
-        assert 'features' in result
-        features = result['features']
-
-        # 地名語のチェック
-        for feature in features:
-            prop = feature['properties']
-            if prop['surface'] in ('西東京市',):
-                assert prop['node_type'] == 'GEOWORD'
-            elif prop['surface'] in ('田無市', '保谷市',):
-                assert prop['node_type'] == 'NORMAL'
-            else:
-                assert prop['node_type'] == 'NORMAL'
-
-        write_resreq(query, result)
-
-    def test_time_overlaps(self, client):
-        """
-        Test 'time-overlaps' filter.
-
-        Notes
-        -----
-        'time-overlaps' に日時または日時のペアを指定すると、
-        その時点・期間の終了時より後に存在した地名語だけが
-        候補になります。
-
-        西東京市は指定した期間内に設置されたので
-        田無市と保谷市、西東京市は全て地名語になります。
-        """
-        query = {
-            'method': 'geonlp.parse',
-            'params': {
-                'sentence': self.sentence,
-                'options': {
-                    'time-overlaps': ['2000-01-01', '2001-02-01']
-                }
-            },
-            'id': 'test_time_overlaps',
-        }
-        expected = '*'
-        result = validate_jsonrpc(client, query, expected)
-
-        # GeoJSON Feature Collection のチェック
-        assert result['type'] == 'FeatureCollection'
-        assert 'features' in result
-        features = result['features']
-
-        # 地名語のチェック
-        for feature in features:
-            prop = feature['properties']
-            if prop['surface'] in ('田無市', '保谷市', '西東京市',):
-                assert prop['node_type'] == 'GEOWORD'
-            else:
-                assert prop['node_type'] == 'NORMAL'
-
-        write_resreq(query, result)
-
-    def test_time_covers(self, client):
-        """
-        Test 'time-covers' filter.
-
-        Notes
-        -----
-        'time-covers' に日時または日時のペアを指定すると、
-        その期間の開始時より終了時まで存在し続けた地名語だけが
-        候補になります。
-
-        西東京市は指定した期間内に設置され、
-        田無市と保谷市は期間内に廃止されたので、
-        田無市、保谷市、西東京市は全て固有名詞になります。
-        """
-        query = {
-            'method': 'geonlp.parse',
-            'params': {
-                'sentence': self.sentence,
-                'options': {
-                    'time-covers': ['2000-01-01', '2001-02-01']
-                }
-            },
-            'id': 'test_time_covers',
-        }
-        expected = '*'
-        result = validate_jsonrpc(client, query, expected)
-
-        # GeoJSON Feature Collection のチェック
-        assert result['type'] == 'FeatureCollection'
-        assert 'features' in result
-        features = result['features']
-
-        # 地名語のチェック
-        for feature in features:
-            prop = feature['properties']
-            assert prop['node_type'] == 'NORMAL'
-
-        write_resreq(query, result)
+        if save:
+            write_resreq(query, result)
@@ -1,7 +1,75 @@
-import glob
 import os
+import sys
 
 from setuptools import setup, Extension
+from setuptools.command.build_ext import build_ext
+
+
+class ParallelBuildExt(build_ext):
+    """
+    A build_ext command that compiles the C++ sources in parallel.
+
+    The source files of the extension are independent of each other,
+    so dispatching them to a thread pool shortens the build time
+    almost linearly with the number of cores.
+    Set the environment variable PYGEONLP_PARALLEL=0 to disable.
+    """
+
+    def build_extensions(self):
+        if sys.platform != 'win32' and \
+                os.environ.get('PYGEONLP_PARALLEL', '1') == '1':
+            self._enable_parallel_compile()
+
+        super().build_extensions()
+
+    def _enable_parallel_compile(self):
+        from concurrent.futures import ThreadPoolExecutor
+
+        compiler = self.compiler
+
+        def compile_parallel(sources, output_dir=None, macros=None,
+                             include_dirs=None, debug=0,
+                             extra_preargs=None, extra_postargs=None,
+                             depends=None):
+            macros, objects, extra_postargs, pp_opts, build = \
+                compiler._setup_compile(
+                    output_dir, macros, include_dirs, sources,
+                    depends, extra_postargs)
+            cc_args = compiler._get_cc_args(pp_opts, debug, extra_preargs)
+
+            def compile_object(obj):
+                try:
+                    src, ext = build[obj]
+                except KeyError:
+                    return
+
+                compiler._compile(
+                    obj, src, ext, cc_args, extra_postargs, pp_opts)
+
+            with ThreadPoolExecutor(
+                    max_workers=os.cpu_count()) as executor:
+                # list() で例外を伝播させる
+                list(executor.map(compile_object, objects))
+
+            return objects
+
+        compiler.compile = compile_parallel
+
+
+def _scan(path, exts=None):
+    """
+    Returns the list of files directly under path whose extension
+    is in exts, or of all files that have an extension when exts
+    is None.  Unlike glob.glob, a single os.scandir pass lists
+    the directory without a per-entry fnmatch.
+    """
+    with os.scandir(path) as entries:
+        return sorted(
+            entry.path for entry in entries
+            if entry.is_file()
+            and os.path.splitext(entry.name)[1] != ''
+            and (exts is None
+                 or os.path.splitext(entry.name)[1] in exts))
 
 
 # Target Files
@@ -9,15 +77,15 @@ BASE_DIR = os.path.dirname(__file__)
 LIBGEONLP_DIR = os.path.join(BASE_DIR, 'libgeonlp')
 LIBGEONLP_INCLUDE_DIR = os.path.join(LIBGEONLP_DIR, 'include')
 LIBGEONLP_SOURCE_DIR = os.path.join(LIBGEONLP_DIR, 'lib')
-LIBGEONLP_FILES = glob.glob(os.path.join(LIBGEONLP_SOURCE_DIR, '*.cpp'))
-LIBGEONLP_HEADERS = glob.glob(os.path.join(LIBGEONLP_INCLUDE_DIR, '*.h'))
-CPYGEONLP_FILES = glob.glob(os.path.join(LIBGEONLP_DIR, '*.cpp'))
+LIBGEONLP_FILES = _scan(LIBGEONLP_SOURCE_DIR, {'.cpp'})
+LIBGEONLP_HEADERS = _scan(LIBGEONLP_INCLUDE_DIR, {'.h'})
+CPYGEONLP_FILES = _scan(LIBGEONLP_DIR, {'.cpp'})
 
 # Other Variables
 DESCRIPTION = __doc__
 LONG_DESCRIPTION = open("README.md", "r", encoding="utf-8").read()
 LICENSE = '2-Clause "Simplified" BSD License'
-DATA_FILES = glob.glob(os.path.join(BASE_DIR, 'base_data', '*.*'))
+DATA_FILES = _scan(os.path.join(BASE_DIR, 'base_data'))
 
 
 def get_libgeonlp():
@@ -28,28 +96,74 @@ def get_libgeonlp():
     https://stackoverflow.com/questions/28843765/setup-py-check-if-non-python-library-dependency-exists
     """
     from textwrap import dedent
-    import tempfile
-    import shutil
-    import distutils.sysconfig
-    import distutils.ccompiler
-    from distutils.errors import LinkError
+    import hashlib
+    import json
+    import platform
+    import shlex
+    import subprocess
+    import sysconfig
 
-    boost_libs = ['boost_regex', 'boost_system', 'boost_filesystem']
+    # Only boost_regex is needed; the filesystem code uses
+    # std::filesystem from C++17.
+    boost_libs = ['boost_regex']
 
     # Search boost dirs
+    # Explicit locations (BOOST_ROOT, conda env, the Python prefix)
+    # are consulted first, then the platform-appropriate default
+    # prefix, so that the common case needs a single stat call and
+    # Apple Silicon picks up /opt/homebrew before /usr/local.
+    prefixes = [
+        os.environ.get('BOOST_ROOT'),
+        os.environ.get('CONDA_PREFIX'),
+        sys.prefix,
+    ]
+    if sys.platform == 'darwin' and platform.machine() == 'arm64':
+        prefixes += ['/opt/homebrew', '/usr/local', '/opt', '/usr']
+    else:
+        prefixes += ['/usr', '/usr/local', '/opt', '/opt/homebrew']
+
     boost_inc_dirs = None
     boost_lib_dirs = None
     extra_preargs = []
-    for prefix in ('/usr', '/usr/local', '/opt', '/opt/homebrew'):
-        if os.path.isdir(os.path.join(prefix, 'include/boost')):
+    for prefix in prefixes:
+        if prefix is None:
+            continue
+
+        # Check the header actually used by libgeonlp
+        if os.path.exists(
+                os.path.join(prefix, 'include/boost/regex.hpp')):
             boost_inc_dirs = [os.path.join(prefix, 'include')]
             boost_lib_dirs = [os.path.join(prefix, 'lib')]
-            if 'brew' in prefix:  # MacOSX + Homebrew
-                os.environ["CFLAGS"] = '-std=c++14'
-
             break
 
-    # Write a temporary .c file to compile
+    cxx = os.environ.get('CXX') \
+        or sysconfig.get_config_var('CXX') or 'c++'
+
+    # The compile-and-link probe below costs a full compiler
+    # invocation, so its result is cached and reused as long as
+    # the environment is unchanged.
+    probe_key = hashlib.md5(json.dumps([
+        platform.platform(),
+        cxx,
+        boost_libs,
+        boost_inc_dirs,
+        boost_lib_dirs,
+    ]).encode('utf-8')).hexdigest()
+    cache_path = os.path.join(
+        os.path.expanduser('~'), '.cache', 'pygeonlp', 'boost_probe.json')
+    cached_probes = {}
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cached_probes = json.load(f)
+    except (OSError, ValueError):
+        pass
+
+    libraries = cached_probes.get(probe_key)
+    if libraries is not None:
+        return build_extension(
+            libraries, boost_inc_dirs, boost_lib_dirs)
+
+    # A small program that exercises boost::regex
     c_code = dedent("""
     #include <iostream>
     #include <string>
@@ -70,69 +184,101 @@ def get_libgeonlp():
     }
     """)
 
-    tmp_dir = tempfile.mkdtemp(prefix='tmp_boost_')
-    bin_file_name = os.path.join(tmp_dir, 'test_boost')
-    file_name = bin_file_name + '.cpp'
-    with open(file_name, 'w') as fp:
-        fp.write(c_code)
-
-    # Try compile and link it
-    compiler = distutils.ccompiler.new_compiler()
-    assert isinstance(compiler, distutils.ccompiler.CCompiler)
-    distutils.sysconfig.customize_compiler(compiler)
-
-    compiled = compiler.compile(
-        sources=[file_name],
-        include_dirs=boost_inc_dirs,
-        output_dir='test_boost'
-    )
+    # Try to compile and link it in one compiler invocation,
+    # reading the source from stdin and discarding the output,
+    # so that no temporary files are created.
+    base_args = shlex.split(cxx) + ['-x', 'c++', '-', '-o', os.devnull]
+    for inc_dir in (boost_inc_dirs or []):
+        base_args.append('-I' + inc_dir)
+    for lib_dir in (boost_lib_dirs or []):
+        base_args.append('-L' + lib_dir)
 
     libraries = None
-    if not libraries:
+    for candidates in (boost_libs,
+                       [lib + '-mt' for lib in boost_libs]):
+        args = base_args + ['-l' + lib for lib in candidates]
         try:
-            compiler.link_shared_lib(
-                compiled,
-                bin_file_name,
-                library_dirs=boost_lib_dirs,
-                libraries=boost_libs,
-            )
-        except LinkError:
-            pass
-        else:
-            libraries = boost_libs
-
-    if not libraries:
-        boost_mt_libs = [lib + '-mt' for lib in boost_libs]
-        try:
-            compiler.link_shared_lib(
-                compiled,
-                bin_file_name,
-                library_dirs=boost_lib_dirs,
-                libraries=boost_mt_libs,
-            )
-        except LinkError:
-            pass
-        else:
-            libraries = boost_mt_libs
+            proc = subprocess.run(
+                args, input=c_code.encode('utf-8'),
+                capture_output=True)
+        except OSError:  # compiler not found
+            break
 
-    shutil.rmtree(tmp_dir)
-    shutil.rmtree('test_boost')
+        if proc.returncode == 0:
+            libraries = candidates
+            break
 
     if not libraries:
         raise RuntimeError("Boost libraries is not installed.")
 
+    try:
+        os.makedirs(os.path.dirname(cache_path), 0o755, exist_ok=True)
+        cached_probes[probe_key] = libraries
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            json.dump(cached_probes, f)
+    except OSError:
+        # キャッシュの書き込みに失敗してもビルドは継続する
+        pass
+
+    return build_extension(libraries, boost_inc_dirs, boost_lib_dirs)
+
+
+def build_extension(libraries, boost_inc_dirs, boost_lib_dirs):
+    """
+    Returns the C++ extension `libgeonlp` linked against
+    the given Boost libraries.
+    """
+    # Optimization flags.
+    # Keep the default ISA-independent so that built wheels stay
+    # portable; machine specific flags such as '-march=native' can be
+    # added through the PYGEONLP_EXTRA_CFLAGS environment variable.
+    if sys.platform != 'win32':
+        extra_compile_args = ['-std=c++17', '-O3']
+    else:
+        extra_compile_args = ['/std:c++17']
+
+    extra_compile_args += os.environ.get(
+        'PYGEONLP_EXTRA_CFLAGS', '').split()
+
+    # Profile-guided optimization (GCC).
+    # Build once with PYGEONLP_PGO=generate, run a training
+    # workload such as 'pytest pygeonlp/webapi/tests', then
+    # rebuild with PYGEONLP_PGO=use.
+    extra_link_args = []
+    pgo = os.environ.get('PYGEONLP_PGO')
+    if pgo and sys.platform != 'win32':
+        pgo_dir = os.environ.get(
+            'PYGEONLP_PGO_DIR',
+            os.path.join(os.path.expanduser('~'),
+                         '.cache', 'pygeonlp', 'pgo'))
+        if pgo == 'generate':
+            pgo_flags = ['-fprofile-generate=' + pgo_dir]
+        elif pgo == 'use':
+            pgo_flags = ['-fprofile-use=' + pgo_dir,
+                         '-fprofile-correction']
+        else:
+            raise RuntimeError(
+                "PYGEONLP_PGO must be 'generate' or 'use'.")
+
+        extra_compile_args += pgo_flags
+        extra_link_args += pgo_flags
+
     libgeonlp = Extension(
         # see: https://setuptools.pypa.io/en/latest/deprecated/distutils/apiref.html#distutils.ccompiler.gen_preprocess_options  # noqa: E501
         'pygeonlp.capi',
         define_macros=[
             ('MAJOR_VERSION', '1'),
             ('MINOR_VERSION', '2'),
-            ('REVISION', '3')
+            ('REVISION', '3'),
+            ('NDEBUG', None),
+            ('BOOST_DISABLE_ASSERTS', None)
         ],
         include_dirs=[LIBGEONLP_INCLUDE_DIR] + boost_inc_dirs,
         library_dirs=[LIBGEONLP_SOURCE_DIR] + boost_lib_dirs,
         sources=LIBGEONLP_FILES + CPYGEONLP_FILES,
         libraries=['sqlite3', 'mecab'] + libraries,
+        extra_compile_args=extra_compile_args,
+        extra_link_args=extra_link_args,
     )
     return libgeonlp
 
@@ -148,6 +294,7 @@ setup(
     long_description=LONG_DESCRIPTION,
     long_description_content_type='text/markdown',
     ext_modules=[get_libgeonlp()],
+    cmdclass={'build_ext': ParallelBuildExt},
     packages=['pygeonlp.api', 'pygeonlp.webapi'],
     entry_points={
         'console_scripts': [